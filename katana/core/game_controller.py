@@ -1,5 +1,6 @@
 import os
 import time
+import asyncio
 import subprocess
 import logging
 import psutil
@@ -22,6 +23,9 @@ class GameController:
         
         self.current_game = None
         self.process = None
+        
+        # (timestamp, [(name, pid), ...]) reused by is_game_running polls
+        self._proc_cache = (0.0, [])
     
     def launch_steam_game(self, app_id, launch_options=None):
         """Launch a game through Steam"""
@@ -60,6 +64,7 @@ class GameController:
                                           stdout=subprocess.PIPE, 
                                           stderr=subprocess.PIPE,
                                           creationflags=subprocess.CREATE_NO_WINDOW if os.name == 'nt' else 0)
+            self.invalidate_process_cache()
             
             logger.info(f"Steam launch command executed for app {app_id}")
             return self.process
@@ -87,6 +92,7 @@ class GameController:
             self.process = subprocess.Popen(cmd,
                                           stdout=subprocess.PIPE,
                                           stderr=subprocess.PIPE)
+            self.invalidate_process_cache()
             return self.process
         except Exception as e:
             logger.error(f"Failed to launch game directly: {e}")
@@ -138,18 +144,30 @@ class GameController:
             process_name.replace('.exe', ''),
         ]
         
-        for proc in psutil.process_iter(['pid', 'name']):
-            try:
-                proc_name = proc.info['name'].lower()
-                for name in possible_names:
-                    if name.lower() in proc_name:
-                        logger.debug(f"Found running process: {proc.info['name']} (PID: {proc.info['pid']})")
-                        return True
-            except (psutil.NoSuchProcess, psutil.AccessDenied):
-                continue
+        for proc_name, pid in self._running_processes():
+            for name in possible_names:
+                if name.lower() in proc_name.lower():
+                    logger.debug(f"Found running process: {proc_name} (PID: {pid})")
+                    return True
         
         return False
     
+    def _running_processes(self):
+        """Return (name, pid) for running processes, re-reading the list at most every 0.5s"""
+        timestamp, processes = self._proc_cache
+        if time.monotonic() - timestamp > 0.5:
+            processes = []
+            for proc in psutil.process_iter(['pid', 'name']):
+                name = proc.info['name']
+                if name:
+                    processes.append((name, proc.info['pid']))
+            self._proc_cache = (time.monotonic(), processes)
+        return processes
+    
+    def invalidate_process_cache(self):
+        """Force the next is_game_running check to re-read the process list"""
+        self._proc_cache = (0.0, [])
+    
     def close_game(self, process_name=None, force=False):
         """Close a running game"""
         if not process_name and self.current_game:
@@ -186,36 +204,28 @@ class GameController:
                 logger.debug(f"Process access error: {e}")
                 continue
         
+        if closed_any:
+            self.invalidate_process_cache()
         return closed_any
     
     def wait_for_game_to_start(self, timeout=60, process_name=None):
         """Wait for the game to start"""
-        if not process_name and self.current_game:
-            process_name = self.current_game['config'].get('process_name') or Path(self.current_game['config'].get('exe_name', '')).stem
-        
-        if not process_name:
-            logger.error("No process name specified for waiting")
-            return False
-        
-        logger.info(f"Waiting for game to start: {process_name}")
-        
-        start_time = time.time()
-        check_interval = 2  # Check every 2 seconds
-        
-        while time.time() - start_time < timeout:
-            if self.is_game_running(process_name):
-                elapsed = time.time() - start_time
-                logger.info(f"Game started: {process_name} (took {elapsed:.1f}s)")
-                return True
-            
-            logger.debug(f"Game not running yet, waiting... ({time.time() - start_time:.1f}s)")
-            time.sleep(check_interval)
-        
-        logger.warning(f"Timeout waiting for game to start: {process_name}")
-        return False
+        return asyncio.run(self.wait_for_game_to_start_async(timeout, process_name))
     
     def wait_for_game_to_close(self, timeout=60, process_name=None):
         """Wait for the game to close"""
+        return asyncio.run(self.wait_for_game_to_close_async(timeout, process_name))
+    
+    async def wait_for_game_to_start_async(self, timeout=60, process_name=None):
+        """Wait for the game to start on the running event loop; cancel the task to stop waiting"""
+        return await self._wait_for_game(True, timeout, process_name, check_interval=2)
+    
+    async def wait_for_game_to_close_async(self, timeout=60, process_name=None):
+        """Wait for the game to close on the running event loop; cancel the task to stop waiting"""
+        return await self._wait_for_game(False, timeout, process_name, check_interval=1)
+    
+    async def _wait_for_game(self, running, timeout, process_name, check_interval):
+        """Poll until the game's running state equals running, sleeping between checks"""
         if not process_name and self.current_game:
             process_name = self.current_game['config'].get('process_name') or Path(self.current_game['config'].get('exe_name', '')).stem
         
@@ -223,17 +233,22 @@ class GameController:
             logger.error("No process name specified for waiting")
             return False
         
-        logger.info(f"Waiting for game to close: {process_name}")
+        state, done = ("start", "started") if running else ("close", "closed")
+        logger.info(f"Waiting for game to {state}: {process_name}")
         
+        # The process scan runs on the loop's executor so other tasks keep running
+        loop = asyncio.get_running_loop()
         start_time = time.time()
         while time.time() - start_time < timeout:
-            if not self.is_game_running(process_name):
+            if await loop.run_in_executor(None, self.is_game_running, process_name) == running:
                 elapsed = time.time() - start_time
-                logger.info(f"Game closed: {process_name} (took {elapsed:.1f}s)")
+                logger.info(f"Game {done}: {process_name} (took {elapsed:.1f}s)")
                 return True
-            time.sleep(1)
+            
+            logger.debug(f"Game not {done} yet, waiting... ({time.time() - start_time:.1f}s)")
+            await asyncio.sleep(check_interval)
         
-        logger.warning(f"Timeout waiting for game to close: {process_name}")
+        logger.warning(f"Timeout waiting for game to {state}: {process_name}")
         return False
     
     def get_running_games(self):
@@ -6,6 +6,9 @@ import winreg  # For Windows registry access
 
 logger = logging.getLogger(__name__)
 
+# Use the libyaml-backed loader when available
+_SafeLoader = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+
 class GameFinder:
     """Utility to find installed games on the system"""
     
@@ -72,8 +75,8 @@ class GameFinder:
             # Load game configs
             for config_file in config_dir.glob('*.yaml'):
                 try:
-                    with open(config_file, 'r') as f:
-                        game_config = yaml.safe_load(f)
+                    with open(config_file, 'rb') as f:
+                        game_config = yaml.load(f.read(), Loader=_SafeLoader)
                     
                     # Check if config loaded properly
                     if game_config is None:
@@ -190,8 +193,8 @@ class GameFinder:
                                 if config_dir.exists():
                                     for config_file in config_dir.glob('*.yaml'):
                                         try:
-                                            with open(config_file, 'r') as f:
-                                                game_config = yaml.safe_load(f)
+                                            with open(config_file, 'rb') as f:
+                                                game_config = yaml.load(f.read(), Loader=_SafeLoader)
                                                 
                                             if game_config and isinstance(game_config, dict):
                                                 if game_config.get('name') and game_config.get('name') in name:
@@ -21,12 +21,19 @@ class ScreenAnalyzer:
         self.threshold = self.settings.get('template_matching_threshold', 0.8)
         self.screenshot_dir = self.settings.get('screenshot_dir', 'output/screenshots')
         
+        # OpenCL (T-API) matching is opt-in; some drivers are unreliable
+        self.use_opencl = bool(self.settings.get('use_opencl', False)) and cv2.ocl.haveOpenCL()
+        cv2.ocl.setUseOpenCL(self.use_opencl)
+        
         # Ensure screenshot directory exists
         os.makedirs(self.screenshot_dir, exist_ok=True)
         
         # Thread lock for screen capture
         self._capture_lock = threading.Lock()
         
+        # Long-lived MSS instance per thread (MSS handles are thread-bound)
+        self._sct_local = threading.local()
+        
         # Initialize screen capture method
         self._initialize_capture()
     
@@ -53,18 +60,21 @@ class ScreenAnalyzer:
             except ImportError:
                 raise ImportError("Either MSS or PyAutoGUI is required for screen capture")
     
-    def capture_screen(self, region=None):
-        """Capture the current screen or a region of it (thread-safe)"""
+    def capture_screen(self, region=None, gray=False):
+        """Capture the current screen or a region of it (thread-safe)
+        
+        With gray=True a single-channel image is converted straight from the captured pixels.
+        """
         with self._capture_lock:
-            return self._capture_screen_internal(region)
+            return self._capture_screen_internal(region, gray)
     
-    def _capture_screen_internal(self, region=None):
+    def _capture_screen_internal(self, region=None, gray=False):
         """Internal screen capture method"""
         try:
             if self.capture_method == 'mss':
-                return self._capture_with_mss(region)
+                return self._capture_with_mss(region, gray)
             elif self.capture_method == 'pyautogui':
-                return self._capture_with_pyautogui(region)
+                return self._capture_with_pyautogui(region, gray)
         except Exception as e:
             logger.error(f"Screen capture failed with {self.capture_method}, trying fallback: {e}")
             # Try the other method as fallback
@@ -72,46 +82,82 @@ class ScreenAnalyzer:
                 if self.capture_method == 'mss':
                     logger.info("Falling back to PyAutoGUI")
                     self.capture_method = 'pyautogui'
-                    return self._capture_with_pyautogui(region)
+                    return self._capture_with_pyautogui(region, gray)
                 else:
                     logger.info("Falling back to MSS")
                     self.capture_method = 'mss'
-                    return self._capture_with_mss(region)
+                    return self._capture_with_mss(region, gray)
             except Exception as e2:
                 logger.error(f"Both capture methods failed: {e2}")
                 raise
     
-    def _capture_with_mss(self, region=None):
-        """Capture screen using MSS"""
-        import mss
+    def _get_sct(self):
+        """Return the calling thread's reusable MSS instance"""
+        sct = getattr(self._sct_local, 'sct', None)
+        if sct is None:
+            import mss
+            sct = self._sct_local.sct = mss.mss()
+        return sct
+    
+    def close_thread_capture(self):
+        """Close the calling thread's MSS instance, if it has one
+        
+        Call from a capture thread before it exits; otherwise its MSS handle
+        (GDI device contexts on Windows, an X connection on Linux) leaks.
+        """
+        sct = getattr(self._sct_local, 'sct', None)
+        if sct is not None:
+            del self._sct_local.sct
+            sct.close()
+    
+    def _capture_with_mss(self, region=None, gray=False):
+        """Capture screen using MSS
+        
+        Returns a BGR view over the grabbed BGRA buffer rather than a converted copy;
+        each grab owns its own buffer, so the view stays valid after later captures.
+        """
+        sct = self._get_sct()
         
-        # Create a new MSS instance for this thread
-        with mss.mss() as sct:
-            # Get dynamic monitor
-            game_process = getattr(self, 'current_game_process', None)
-            monitor_index = self._get_game_monitor(game_process)
+        # Get dynamic monitor
+        game_process = getattr(self, 'current_game_process', None)
+        monitor_index = self._get_game_monitor(game_process)
+        
+        if region:
+            # Convert normalized region to pixel coordinates
+            monitor = sct.monitors[monitor_index]  # Dynamic monitor
+            x, y, right, bottom = region
+            width, height = monitor['width'], monitor['height']
             
-            if region:
-                # Convert normalized region to pixel coordinates
-                monitor = sct.monitors[monitor_index]  # Dynamic monitor
-                x, y, right, bottom = region
-                width, height = monitor['width'], monitor['height']
-                
-                x = int(x * width)
-                y = int(y * height)
-                right = int(right * width)
-                bottom = int(bottom * height)
-                
-                sct_region = {'top': y, 'left': x, 'width': right - x, 'height': bottom - y}
-                sct_img = sct.grab(sct_region)
-            else:
-                sct_img = sct.grab(sct.monitors[monitor_index])  # Dynamic monitor
+            x = int(x * width)
+            y = int(y * height)
+            right = int(right * width)
+            bottom = int(bottom * height)
             
-            # Convert to numpy array
-            img = np.array(sct_img)
-            return cv2.cvtColor(img, cv2.COLOR_BGRA2BGR)
+            sct_region = {'top': y, 'left': x, 'width': right - x, 'height': bottom - y}
+            sct_img = sct.grab(sct_region)
+        else:
+            sct_img = sct.grab(sct.monitors[monitor_index])  # Dynamic monitor
+        
+        return self._from_bgra(sct_img, gray)
+    
+    def _from_bgra(self, sct_img, gray=False):
+        """View an MSS grab's raw BGRA pixels in place, dropping alpha or converting to grayscale"""
+        img = np.frombuffer(sct_img.raw, dtype=np.uint8).reshape(sct_img.height, sct_img.width, 4)
+        if gray:
+            return cv2.cvtColor(img, cv2.COLOR_BGRA2GRAY)
+        return img[:, :, :3]
+    
+    def capture_box(self, box, gray=False):
+        """Capture an absolute screen rectangle {'left', 'top', 'width', 'height'} in pixels (thread-safe)"""
+        with self._capture_lock:
+            if self.capture_method == 'mss':
+                return self._from_bgra(self._get_sct().grab(box), gray)
+            
+            import pyautogui
+            screenshot = pyautogui.screenshot(region=(box['left'], box['top'], box['width'], box['height']))
+            return cv2.cvtColor(np.array(screenshot), cv2.COLOR_RGB2GRAY if gray else cv2.COLOR_RGB2BGR)
     
-    def _capture_with_pyautogui(self, region=None):
+    def _capture_with_pyautogui(self, region=None, gray=False):
         """Capture screen using PyAutoGUI"""
         import pyautogui
         
@@ -132,7 +178,7 @@ class ScreenAnalyzer:
         
         # Convert PIL Image to numpy array
         img = np.array(screenshot)
-        return cv2.cvtColor(img, cv2.COLOR_RGB2BGR)
+        return cv2.cvtColor(img, cv2.COLOR_RGB2GRAY if gray else cv2.COLOR_RGB2BGR)
     
     def save_screenshot(self, name=None):
         """Capture and save a screenshot (thread-safe)"""
@@ -149,7 +195,7 @@ class ScreenAnalyzer:
             # Ensure directory exists
             os.makedirs(os.path.dirname(path), exist_ok=True)
             
-            success = cv2.imwrite(path, img)
+            success = cv2.imwrite(path, img, [cv2.IMWRITE_PNG_COMPRESSION, 1])
             
             if success:
                 logger.info(f"Screenshot saved: {path}")
@@ -162,6 +208,46 @@ class ScreenAnalyzer:
             logger.error(f"Error saving screenshot: {e}")
             return None
     
+    @staticmethod
+    def read_template(template_path):
+        """Load a template file as (8-bit grayscale image, mask or None), or (None, None)
+        
+        Matching runs on single-channel images everywhere (the engine as well as the
+        GUI's test and monitor tools), so confidence values are comparable between them.
+        Templates with transparent pixels get a mask that is 0 where alpha is 0;
+        matching ignores those pixels.
+        """
+        image = cv2.imread(str(template_path), cv2.IMREAD_UNCHANGED)
+        if image is None:
+            return None, None
+        if image.dtype != np.uint8:
+            # 16-bit PNGs: keep the high byte so the template matches 8-bit captures
+            image = (image >> 8).astype(np.uint8) if image.dtype == np.uint16 else cv2.convertScaleAbs(image)
+        if image.ndim == 2:
+            return image, None
+        if image.shape[2] == 4:
+            template = cv2.cvtColor(image, cv2.COLOR_BGRA2GRAY)
+            alpha = image[:, :, 3]
+            if alpha.min() < 255:
+                return template, cv2.threshold(alpha, 0, 255, cv2.THRESH_BINARY)[1]
+            return template, None
+        return cv2.cvtColor(image, cv2.COLOR_BGR2GRAY), None
+    
+    @staticmethod
+    def _match(screen, template, mask):
+        """TM_CCOEFF_NORMED result map; masked windows that are flat under the mask score 0"""
+        if mask is None:
+            return cv2.matchTemplate(screen, template, cv2.TM_CCOEFF_NORMED)
+        result = cv2.matchTemplate(screen, template, cv2.TM_CCOEFF_NORMED, mask=mask)
+        return np.nan_to_num(result, copy=False, nan=0.0, posinf=0.0, neginf=0.0)
+    
+    @staticmethod
+    def _gray(screen):
+        """Single-channel version of a captured or caller-supplied frame"""
+        if screen.ndim == 3:
+            return cv2.cvtColor(screen, cv2.COLOR_BGR2GRAY)
+        return screen
+    
     def match_template(self, template_path, screen=None, region=None, threshold=None):
         """Check if a template matches the current screen"""
         if threshold is None:
@@ -172,14 +258,16 @@ class ScreenAnalyzer:
             logger.error(f"Template not found: {template_path}")
             return False, None
         
-        template = cv2.imread(template_path)
+        template, mask = self.read_template(template_path)
         if template is None:
             logger.error(f"Failed to load template: {template_path}")
             return False, None
         
         # Capture screen if not provided
         if screen is None:
-            screen = self.capture_screen(region)
+            screen = self.capture_screen(region, gray=True)
+        else:
+            screen = self._gray(screen)
         
         # Ensure template isn't larger than screen
         if template.shape[0] > screen.shape[0] or template.shape[1] > screen.shape[1]:
@@ -187,24 +275,12 @@ class ScreenAnalyzer:
             return False, None
         
         # Match template
-        result = cv2.matchTemplate(screen, template, cv2.TM_CCOEFF_NORMED)
+        result = self._match(screen, template, mask)
         min_val, max_val, min_loc, max_loc = cv2.minMaxLoc(result)
         
         if max_val >= threshold:
-            # Calculate the center point of the match (LOCAL coordinates)
-            match_h, match_w = template.shape[:2]
-            local_x = max_loc[0] + match_w // 2
-            local_y = max_loc[1] + match_h // 2
-            
-            # Convert to GLOBAL screen coordinates
-            game_process = getattr(self, 'current_game_process', None)
-            monitor_index = self._get_game_monitor(game_process)
-            
-            import mss
-            with mss.mss() as sct:
-                monitor = sct.monitors[monitor_index]
-                global_x = local_x + monitor['left']
-                global_y = local_y + monitor['top']
+            # Center point of the match in GLOBAL screen coordinates
+            global_x, global_y = self.match_center(max_loc, template.shape)
             
             logger.debug(f"Template matched: {template_path} at global ({global_x}, {global_y}) confidence: {max_val:.2f}")
             return True, (global_x, global_y)
@@ -212,6 +288,18 @@ class ScreenAnalyzer:
             logger.debug(f"Template not matched: {template_path} (confidence: {max_val:.2f})")
             return False, None
     
+    def match_center(self, max_loc, template_shape):
+        """Convert a match's top-left corner (LOCAL coordinates) to its GLOBAL center point"""
+        match_h, match_w = template_shape[:2]
+        local_x = max_loc[0] + match_w // 2
+        local_y = max_loc[1] + match_h // 2
+        
+        game_process = getattr(self, 'current_game_process', None)
+        monitor_index = self._get_game_monitor(game_process)
+        
+        monitor = self._get_sct().monitors[monitor_index]
+        return local_x + monitor['left'], local_y + monitor['top']
+    
     def wait_for_template(self, template_path, timeout=30, region=None, threshold=None):
         """Wait for a template to appear on screen"""
         if threshold is None:
@@ -268,17 +356,19 @@ class ScreenAnalyzer:
             logger.error(f"Template not found: {template_path}")
             return []
         
-        template = cv2.imread(template_path)
+        template, mask = self.read_template(template_path)
         if template is None:
             logger.error(f"Failed to load template: {template_path}")
             return []
         
         # Capture screen if not provided
         if screen is None:
-            screen = self.capture_screen(region)
+            screen = self.capture_screen(region, gray=True)
+        else:
+            screen = self._gray(screen)
         
         # Match template
-        result = cv2.matchTemplate(screen, template, cv2.TM_CCOEFF_NORMED)
+        result = self._match(screen, template, mask)
         
         # Find all matches above threshold
         locations = np.where(result >= threshold)
@@ -5,11 +5,25 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+# Use the libyaml-backed loader/dumper when available
+_SafeLoader = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+_SafeDumper = getattr(yaml, 'CSafeDumper', yaml.SafeDumper)
+
+class _ConfigDumper(_SafeDumper):
+    """Dumper for game configs: block style (yaml.dump's default) and no anchors
+    
+    Configs are plain trees, so alias tracking would only cost an id() lookup
+    per node and could turn repeated lists into &id001 references.
+    """
+    
+    def ignore_aliases(self, data):
+        return True
+
 def load_settings(settings_path="config/settings.yaml"):
     """Load global settings from YAML"""
     try:
-        with open(settings_path, 'r') as f:
-            settings = yaml.safe_load(f)
+        with open(settings_path, 'rb') as f:
+            settings = yaml.load(f.read(), Loader=_SafeLoader)
         return settings
     except Exception as e:
         logger.error(f"Error loading settings: {str(e)}")
@@ -24,8 +38,7 @@ def load_game_config(game_name):
         return None
     
     try:
-        with open(config_path, 'r') as f:
-            config = yaml.safe_load(f)
+        config = yaml.load(config_path.read_bytes(), Loader=_SafeLoader)
         return config
     except Exception as e:
         logger.error(f"Error loading game configuration: {str(e)}")
@@ -47,8 +60,10 @@ def save_game_config(config, game_name=None):
         os.makedirs(config_path.parent, exist_ok=True)
         
         # Save configuration
-        with open(config_path, 'w') as f:
-            yaml.dump(config, f, default_flow_style=False)
+        # No line wrapping and no \u escapes: less emitter work per scalar
+        # (libyaml's emitter needs an int width, so "unbounded" is INT_MAX)
+        config_path.write_bytes(yaml.dump(config, Dumper=_ConfigDumper, width=2**31 - 1,
+                                          allow_unicode=True).encode('utf-8'))
         
         logger.info(f"Game configuration saved: {config_path}")
         return True
@@ -1,12 +1,341 @@
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog, simpledialog
+import asyncio
+import copy
+import gc
 import threading
+import queue
 import yaml
 import os
 import logging
+import subprocess
+import sys
 import time
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from datetime import datetime
+from types import MappingProxyType
+
+# Imported up front so the first template capture/test doesn't stall the Tk loop;
+# the GUI still starts without OpenCV and reports it when a cv2 feature is used
+try:
+    import cv2
+    import numpy as np
+except ImportError:
+    cv2 = None
+    np = None
+
+# Optional: JIT-compiles the NCC normalisation loop used by _dft_ncc
+try:
+    import numba
+except ImportError:
+    numba = None
+
+# Use the libyaml-backed loader/dumper when available
+_SafeLoader = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+_SafeDumper = getattr(yaml, 'CSafeDumper', yaml.SafeDumper)
+
+# Default global settings, serialized once per process for _create_default_settings
+_DEFAULT_SETTINGS = MappingProxyType({
+    'steam_path': 'C:/Program Files (x86)/Steam',
+    'epic_path': 'C:/Program Files/Epic Games',
+    'steam_launch_options': '',
+    'screenshot_dir': 'output/screenshots',
+    'log_level': 'INFO',
+    'template_matching_threshold': 0.8,
+    'use_opencl': False,
+    'input_delay': 0.5,
+    'timeout': 300,
+    'mouse_move_duration': 0.6,
+    'pre_click_delay': 0.4,
+    'post_click_delay': 0.8
+})
+_DEFAULT_SETTINGS_YAML = yaml.dump(dict(_DEFAULT_SETTINGS), Dumper=_SafeDumper,
+                                   default_flow_style=False).encode('utf-8')
+
+# Leaf directories of the default layout; shared parents are created only once
+_REQUIRED_DIRS = ('config/games', 'templates/screens', 'output/logs', 'output/screenshots')
+
+# Workflow log banner separator and timestamp format
+_SEP = "=" * 80
+_TS_FMT = '%Y-%m-%d %H:%M:%S'
+
+# Template image extensions, matched with a plain suffix compare on lowercased names
+_TEMPLATE_SUFFIXES = ('.png', '.jpg')
+
+# Resolved once at import; the platform cannot change while the GUI runs
+_IS_WIN = sys.platform.startswith("win")
+_IS_MAC = sys.platform == "darwin"
+
+# Coarse-to-fine template search: at most this many pyrDown levels, never shrinking
+# the template below _PYR_MIN_SIDE; coarse peaks within _PYR_MARGIN of the best one
+# are refined at full resolution, and too many of them falls back to a full search
+_PYR_LEVELS = 2
+_PYR_MIN_SIDE = 8
+_PYR_MARGIN = 0.15
+_PYR_MAX_ROIS = 8
+# Monitoring polls whose coarse score is this far under the threshold skip refinement
+_PYR_SLACK = 0.1
+
+# Rows shown by the template test dialog; all are derived from one match score
+_TEST_THRESHOLDS = (0.9, 0.8, 0.7, 0.6, 0.5)
+
+# Full-screen searches with templates at least this large use DFT-based correlation
+_DFT_MIN_AREA = 324
+
+# Seconds a monitor enumeration is reused; displays can change without the window moving
+_MONITOR_TTL = 2.0
+
+def _build_pyramid(image, levels=_PYR_LEVELS):
+    """Return [image, image/2, ...] stopping before a side drops under _PYR_MIN_SIDE"""
+    pyramid = [image]
+    for _ in range(levels):
+        if min(pyramid[-1].shape[:2]) // 2 < _PYR_MIN_SIDE:
+            break
+        pyramid.append(cv2.pyrDown(pyramid[-1]))
+    return pyramid
+
+
+def _dft_ncc(screen, template, buf, spectra=None):
+    """TM_CCOEFF_NORMED result map computed through cv2.dft
+    
+    The numerator correlates the screen with the zero-mean template in the frequency
+    domain; the local screen variance comes from integral images. buf holds the padded
+    DFT inputs and is reused while the screen size stays the same. spectra, when given,
+    keeps the template's spectra per DFT size so later calls only transform the screen.
+    """
+    template_h, template_w = template.shape[:2]
+    screen_h, screen_w = screen.shape[:2]
+    result_h, result_w = screen_h - template_h + 1, screen_w - template_w + 1
+    channels = 1 if screen.ndim == 2 else screen.shape[2]
+    
+    dft_size = (cv2.getOptimalDFTSize(screen_h), cv2.getOptimalDFTSize(screen_w))
+    if buf.get('size') != dft_size:
+        buf['size'] = dft_size
+        buf['screen'] = np.zeros(dft_size, np.float32)
+    screen_pad = buf['screen']
+    
+    cached = spectra.get(dft_size) if spectra is not None else None
+    if cached is None:
+        template_f = template.reshape(template_h, template_w, channels).astype(np.float32)
+        template_f -= template_f.mean(axis=(0, 1))
+        template_pad = np.zeros(dft_size, np.float32)
+        template_dfts = []
+        for c in range(channels):
+            template_pad[:template_h, :template_w] = template_f[:, :, c]
+            template_dfts.append(cv2.dft(template_pad))
+        cached = (template_dfts, float(np.square(template_f, dtype=np.float64).sum()))
+        if spectra is not None:
+            spectra[dft_size] = cached
+    template_dfts, template_norm = cached
+    
+    screen_c = screen.reshape(screen_h, screen_w, channels)
+    num = _buffer(buf, 'num', (result_h, result_w), np.float64)
+    num.fill(0)
+    for c in range(channels):
+        screen_pad[:screen_h, :screen_w] = screen_c[:, :, c]
+        spectrum = cv2.mulSpectrums(cv2.dft(screen_pad), template_dfts[c], 0, conjB=True)
+        num += cv2.idft(spectrum, flags=cv2.DFT_SCALE | cv2.DFT_REAL_OUTPUT)[:result_h, :result_w]
+    
+    sums, sqsums = cv2.integral2(screen, sdepth=cv2.CV_64F)
+    sums = sums.reshape(screen_h + 1, screen_w + 1, channels)
+    sqsums = sqsums.reshape(screen_h + 1, screen_w + 1, channels)
+    result = _buffer(buf, 'ncc', (result_h, result_w))
+    return _ncc_normalize(num, sums, sqsums, template_h, template_w, template_norm, result)
+
+
+def _ncc_normalize_numpy(num, sums, sqsums, template_h, template_w, template_norm, out):
+    """Divide the correlation map by the local screen deviation times the template norm"""
+    # Per-window sum of squared deviations, summed over channels
+    window_sum = (sums[template_h:, template_w:] - sums[:-template_h, template_w:]
+                  - sums[template_h:, :-template_w] + sums[:-template_h, :-template_w])
+    window_sqsum = (sqsums[template_h:, template_w:] - sqsums[:-template_h, template_w:]
+                    - sqsums[template_h:, :-template_w] + sqsums[:-template_h, :-template_w])
+    variance = (window_sqsum - window_sum * window_sum / (template_h * template_w)).sum(axis=2)
+    
+    denom = np.sqrt(np.maximum(variance, 0) * template_norm)
+    
+    # Same rule as OpenCV: near-flat windows, where num is only rounding noise, score 0
+    magnitude = np.abs(num)
+    out[:] = np.where(magnitude < denom, num / np.where(denom > 0, denom, 1),
+                      np.where(magnitude < denom * 1.125, np.sign(num), 0))
+    return out
+
+
+if numba is not None:
+    @numba.njit(parallel=True, fastmath=True, cache=True)
+    def _ncc_normalize(num, sums, sqsums, template_h, template_w, template_norm, out):
+        """Fused single-pass version of _ncc_normalize_numpy, without temporaries"""
+        n = template_h * template_w
+        result_h, result_w = out.shape
+        channels = sums.shape[2]
+        for i in numba.prange(result_h):
+            for j in range(result_w):
+                variance = 0.0
+                for c in range(channels):
+                    s1 = (sums[i + template_h, j + template_w, c] - sums[i, j + template_w, c]
+                          - sums[i + template_h, j, c] + sums[i, j, c])
+                    s2 = (sqsums[i + template_h, j + template_w, c] - sqsums[i, j + template_w, c]
+                          - sqsums[i + template_h, j, c] + sqsums[i, j, c])
+                    variance += s2 - s1 * s1 / n
+                denom = np.sqrt(max(variance, 0.0) * template_norm)
+                value = num[i, j]
+                if abs(value) < denom:
+                    out[i, j] = value / denom
+                elif abs(value) < denom * 1.125:
+                    out[i, j] = 1.0 if value > 0 else -1.0
+                else:
+                    out[i, j] = 0.0
+        return out
+else:
+    _ncc_normalize = _ncc_normalize_numpy
+
+
+def _cuda_available():
+    """True when this OpenCV build has CUDA support and a CUDA device is present"""
+    try:
+        return cv2.cuda.getCudaEnabledDeviceCount() > 0
+    except (AttributeError, cv2.error):
+        return False
+
+
+def _buffer(bufs, role, shape, dtype='float32'):
+    """Scratch array for one role from bufs, reallocated only when its shape changes"""
+    if bufs is None:
+        return np.empty(shape, dtype)
+    out = bufs.get(role)
+    if out is None or out.shape != shape:
+        out = bufs[role] = np.empty(shape, dtype)
+    return out
+
+
+def _ncc_map(screen, template, mask=None, bufs=None, role='map'):
+    """Spatial TM_CCOEFF_NORMED result map, optionally ignoring template pixels where mask is 0
+    
+    The map is written into the bufs array for role, so repeated polls of the same
+    shape reuse one allocation. Masked matching leaves NaN where a window is flat under
+    the mask; those score 0.
+    """
+    shape = (screen.shape[0] - template.shape[0] + 1, screen.shape[1] - template.shape[1] + 1)
+    result = _buffer(bufs, role, shape)
+    if mask is None:
+        return cv2.matchTemplate(screen, template, cv2.TM_CCOEFF_NORMED, result=result)
+    result = cv2.matchTemplate(screen, template, cv2.TM_CCOEFF_NORMED, result=result, mask=mask)
+    return np.nan_to_num(result, copy=False, nan=0.0, posinf=0.0, neginf=0.0)
+
+
+def _umat_match(screen, template, prepared):
+    """TM_CCOEFF_NORMED through OpenCV's T-API, returning (max_val, max_loc)
+    
+    The template's UMat is kept in prepared so it is uploaded once per cache entry.
+    """
+    template_umat = prepared.get('umat')
+    if template_umat is None:
+        template_umat = prepared['umat'] = cv2.UMat(template)
+    result = cv2.matchTemplate(cv2.UMat(screen), template_umat, cv2.TM_CCOEFF_NORMED)
+    _, max_val, _, max_loc = cv2.minMaxLoc(result)
+    return max_val, max_loc
+
+
+def _full_match(screen, template, bufs=None, spectra=None, mask=None, dft=True, role='map'):
+    """TM_CCOEFF_NORMED over the whole screen, returning (max_val, max_loc)
+    
+    Large templates go through _dft_ncc unless dft is False. Masked templates always
+    take the spatial path; the DFT path has no mask support.
+    """
+    if dft and mask is None and template.shape[0] * template.shape[1] >= _DFT_MIN_AREA:
+        result = _dft_ncc(screen, template, bufs if bufs is not None else {}, spectra)
+    else:
+        result = _ncc_map(screen, template, mask, bufs, role)
+    _, max_val, _, max_loc = cv2.minMaxLoc(result)
+    return max_val, max_loc
+
+
+def _pyramid_match(screen, pyramid, bufs=None, spectra=None, masks=None, floor=None):
+    """Match at the coarsest pyramid level, then refine only the promising regions at full size
+    
+    masks, when given, is the pyramid of the template's alpha mask, level for level. When
+    the coarse score is below floor the full-size refinement is skipped and (None, None)
+    is returned, since the downsampled score is not comparable to a full-size one.
+    """
+    template = pyramid[0]
+    mask = masks[0] if masks else None
+    levels = len(pyramid) - 1
+    if levels == 0:
+        return _full_match(screen, template, bufs, spectra, mask)
+    
+    small = screen
+    for _ in range(levels):
+        small = cv2.pyrDown(small)
+    coarse_template = pyramid[-1]
+    if coarse_template.shape[0] > small.shape[0] or coarse_template.shape[1] > small.shape[1]:
+        return _full_match(screen, template, bufs, spectra, mask)
+    
+    coarse = _ncc_map(small, coarse_template, masks[-1] if masks else None, bufs, 'coarse')
+    _, coarse_max, _, coarse_loc = cv2.minMaxLoc(coarse)
+    if floor is not None and coarse_max < floor:
+        return None, None
+    _, peaks = cv2.threshold(coarse, coarse_max - _PYR_MARGIN, 255, cv2.THRESH_BINARY)
+    contours = cv2.findContours(peaks.astype(np.uint8), cv2.RETR_EXTERNAL,
+                                cv2.CHAIN_APPROX_SIMPLE)[-2]
+    if not contours or len(contours) > _PYR_MAX_ROIS:
+        return _full_match(screen, template, bufs, spectra, mask)
+    
+    # Coarse positions are only accurate to one scale step, so pad each box by it
+    scale = 1 << levels
+    template_h, template_w = template.shape[:2]
+    screen_h, screen_w = screen.shape[:2]
+    best_val, best_loc = -1.0, (0, 0)
+    for contour in contours:
+        x, y, w, h = cv2.boundingRect(contour)
+        x0 = max((x - 1) * scale, 0)
+        y0 = max((y - 1) * scale, 0)
+        x1 = min((x + w + 1) * scale + template_w, screen_w)
+        y1 = min((y + h + 1) * scale + template_h, screen_h)
+        if x1 - x0 < template_w or y1 - y0 < template_h:
+            continue
+        max_val, (mx, my) = _full_match(screen[y0:y1, x0:x1], template, bufs, mask=mask,
+                                        dft=False, role='roi')
+        if max_val > best_val:
+            best_val, best_loc = max_val, (x0 + mx, y0 + my)
+    return best_val, best_loc
+
+
+def _active_window_box():
+    """Pixel rectangle of the foreground window as an MSS-style dict, or None if unknown
+    
+    Needs the optional pygetwindow package, which only supports Windows.
+    """
+    try:
+        import pygetwindow
+        win = pygetwindow.getActiveWindow()
+    except Exception:
+        return None
+    if win is None or win.width <= 0 or win.height <= 0:
+        return None
+    return {'left': win.left, 'top': win.top, 'width': win.width, 'height': win.height}
+
+
+def _open_windows(path):
+    os.startfile(path)
+
+def _open_mac(path):
+    subprocess.Popen(['open', path])
+
+def _open_linux(path):
+    subprocess.Popen(['xdg-open', path], stdout=subprocess.DEVNULL,
+                     stderr=subprocess.DEVNULL, start_new_session=True)
+
+# Platform opener picked once at import
+_OPENER = _open_windows if _IS_WIN else _open_mac if _IS_MAC else _open_linux
+
+def _open_in_explorer(path):
+    """Open a file or folder with the platform's default handler without waiting on it"""
+    path = Path(path)
+    if not path.is_absolute():
+        path = path.resolve()
+    _OPENER(str(path))
 
 class KatanaGUI:
     def __init__(self, root):
@@ -30,6 +359,42 @@ class KatanaGUI:
         self.current_run_folder = None
         self.current_game_name = None
         
+        # Resolved once; reused by the template and config folder operations
+        self._templates_dir = Path("templates/screens").resolve()
+        self._config_dir = Path("config").resolve()
+        self._games_config_dir = self._config_dir / "games"
+        
+        # (cache key, sorted template list) for refresh_templates
+        self._template_cache = None
+        
+        # Decoded template images keyed by (path, mtime_ns), bounded LRU; shared by the
+        # Tk thread, the monitor workers and the prefetch, so guarded by a lock
+        self._template_image_cache = OrderedDict()
+        self._template_image_lock = threading.Lock()
+        self._dft_buf = threading.local()  # per-thread DFT and result buffers, see _match_buffers
+        self._gpu_local = threading.local()  # per-thread CUDA matcher state, see _cuda_match
+        self._use_cuda = cv2 is not None and _cuda_available()
+        
+        # Directory of the last saved log, reused by the save dialog
+        self._last_save_dir = None
+        
+        # Run-specific log handler and cached workflow-engine analyzer check
+        self.run_file_handler = None
+        self._has_wf_analyzer = False
+        
+        # (timestamp, monitor geometry) for test_monitor_detection; re-queried after
+        # _MONITOR_TTL seconds or when the main window is moved or resized
+        self._monitor_cache = None
+        root.bind("<Configure>", self._on_root_configure, add="+")
+        
+        # One persistent background event loop runs workflow/launch/close tasks
+        self._loop = asyncio.new_event_loop()
+        threading.Thread(target=self._loop.run_forever, daemon=True).start()
+        
+        # Futures of the running workflow and of a launch/close task; Stop cancels the latter
+        self.workflow_future = None
+        self._game_future = None
+        
         # Set up logging first
         self._setup_logging()
         
@@ -38,6 +403,13 @@ class KatanaGUI:
         
         # Create the GUI
         self.create_widgets()
+        
+        # Install the log widget handler once; actions toggle it via _log_enabled
+        self._log_enabled = threading.Event()
+        self.log_handler = LogTextHandler(self.log_text)
+        self.log_handler.setLevel(logging.INFO)
+        self.log_handler.addFilter(EventGateFilter(self._log_enabled))
+        logging.getLogger().addHandler(self.log_handler)
     
     def _setup_styling(self):
         """Set up modern styling for the GUI"""
@@ -67,44 +439,56 @@ class KatanaGUI:
     def _setup_logging(self):
         """Set up enhanced logging with game-specific and run-specific folders"""
         try:
-            # Create base log directory
-            base_log_dir = Path("output/logs")
-            base_log_dir.mkdir(parents=True, exist_ok=True)
-            
-            # Create main session log (for general GUI operations)
-            session_timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-            session_log_file = base_log_dir / f"katana_session_{session_timestamp}.log"
-            
-            # Create formatters
-            file_formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
-            console_formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
-            
-            # Set up file handler with UTF-8 encoding
-            file_handler = logging.FileHandler(session_log_file, encoding='utf-8')
-            file_handler.setLevel(logging.INFO)
-            file_handler.setFormatter(file_formatter)
+            # Shared module-level formatter
+            file_formatter = console_formatter = _LOG_FMT
             
             # Set up console handler with UTF-8 encoding
-            import sys
             console_handler = logging.StreamHandler(sys.stdout)
             console_handler.setLevel(logging.INFO)
             console_handler.setFormatter(console_formatter)
+            handlers = [console_handler]
+            
+            # KATANA_NO_SESSION_LOG=1 skips the session log file for short-lived usages
+            session_log_file = None
+            if os.environ.get('KATANA_NO_SESSION_LOG') != '1':
+                # Create base log directory
+                base_log_dir = Path("output/logs")
+                base_log_dir.mkdir(parents=True, exist_ok=True)
+                
+                # Create main session log (for general GUI operations)
+                session_timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+                session_log_file = base_log_dir / f"katana_session_{session_timestamp}.log"
+                
+                # Set up buffered file handler with UTF-8 encoding
+                file_handler = BufferedFileHandler(session_log_file)
+                file_handler.setLevel(logging.INFO)
+                file_handler.setFormatter(file_formatter)
+                handlers.insert(0, file_handler)
             
             # Configure logger
             logging.basicConfig(
                 level=logging.INFO,
-                handlers=[file_handler, console_handler],
+                handlers=handlers,
                 force=True  # Override any existing configuration
             )
             
             self.logger = logging.getLogger(__name__)
             self.logger.info("Enhanced Katana logging initialized")
-            self.logger.info(f"Session log: {session_log_file}")
+            if session_log_file:
+                self.logger.info(f"Session log: {session_log_file}")
             
         except Exception as e:
             print(f"Failed to setup logging: {e}")
             self.logger = logging.getLogger(__name__)
     
+    def _submit(self, coro):
+        """Schedule a coroutine on the background event loop"""
+        return asyncio.run_coroutine_threadsafe(coro, self._loop)
+    
+    async def _run_blocking(self, func, *args):
+        """Run a blocking call on the loop's executor without stalling other tasks"""
+        return await self._loop.run_in_executor(None, func, *args)
+    
     def _create_run_specific_logging(self, game_name):
         """Create game-specific and run-specific logging folders"""
         try:
@@ -124,11 +508,11 @@ class KatanaGUI:
             # Create run-specific log file
             run_log_file = self.current_run_folder / f"workflow_{run_timestamp}.log"
             
-            # Create run-specific file handler
+            # Create run-specific file handler; unbuffered so the run folder shows the
+            # whole log while the GUI is still open and survives a crash
             run_file_handler = logging.FileHandler(run_log_file, encoding='utf-8')
             run_file_handler.setLevel(logging.INFO)
-            run_file_formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
-            run_file_handler.setFormatter(run_file_formatter)
+            run_file_handler.setFormatter(_LOG_FMT)
             
             # Add handler to root logger
             logging.getLogger().addHandler(run_file_handler)
@@ -148,7 +532,7 @@ class KatanaGUI:
                 self.logger.info(f"📸 Screenshot dir changed: {old_dir} → {new_dir}")
                 
                 # Also update workflow_engine's screen_analyzer if it exists
-                if hasattr(self, 'workflow_engine') and self.workflow_engine and hasattr(self.workflow_engine, 'screen_analyzer'):
+                if self._has_wf_analyzer:
                     self.workflow_engine.screen_analyzer.screenshot_dir = new_dir
                     self.logger.info(f"📸 Workflow engine screenshot dir updated: {new_dir}")
                 
@@ -161,10 +545,10 @@ class KatanaGUI:
     def _cleanup_run_logging(self):
         """Clean up run-specific logging handlers"""
         try:
-            if hasattr(self, 'run_file_handler'):
+            if self.run_file_handler is not None:
                 logging.getLogger().removeHandler(self.run_file_handler)
                 self.run_file_handler.close()
-                delattr(self, 'run_file_handler')
+                self.run_file_handler = None
                 
             # Reset screenshot directory to default
             default_dir = 'output/screenshots'
@@ -173,7 +557,7 @@ class KatanaGUI:
                 self.logger.info(f"📸 Screenshot dir reset to default: {default_dir}")
                 
                 # Also reset workflow_engine's screen_analyzer
-                if hasattr(self, 'workflow_engine') and self.workflow_engine and hasattr(self.workflow_engine, 'screen_analyzer'):
+                if self._has_wf_analyzer:
                     self.workflow_engine.screen_analyzer.screenshot_dir = default_dir
                     self.logger.info(f"📸 Workflow engine screenshot dir reset to default: {default_dir}")
                 
@@ -201,6 +585,7 @@ class KatanaGUI:
             self.game_controller = GameController()
             self.workflow_engine = WorkflowEngine()
             self.screen_analyzer = ScreenAnalyzer()
+            self._has_wf_analyzer = getattr(self.workflow_engine, 'screen_analyzer', None) is not None
             
             # Find installed games
             self.games = self.game_finder.find_all_games()
@@ -216,33 +601,26 @@ class KatanaGUI:
     def _create_default_config(self):
         """Create default configuration directory and files"""
         try:
-            os.makedirs("config/games", exist_ok=True)
-            os.makedirs("templates/screens", exist_ok=True)
-            os.makedirs("output/logs", exist_ok=True)
-            os.makedirs("output/screenshots", exist_ok=True)
+            created = set()
+            for leaf in _REQUIRED_DIRS:
+                parts = Path(leaf).parts
+                for depth in range(1, len(parts) + 1):
+                    path = os.path.join(*parts[:depth])
+                    if path in created:
+                        continue
+                    try:
+                        os.mkdir(path)
+                    except FileExistsError:
+                        pass
+                    created.add(path)
             self.logger.info("Created config directory structure")
         except Exception as e:
             self.logger.error(f"Failed to create config directory: {e}")
     
     def _create_default_settings(self):
         """Create default settings.yaml file"""
-        default_settings = {
-            'steam_path': 'C:/Program Files (x86)/Steam',
-            'epic_path': 'C:/Program Files/Epic Games',
-            'steam_launch_options': '',
-            'screenshot_dir': 'output/screenshots',
-            'log_level': 'INFO',
-            'template_matching_threshold': 0.8,
-            'input_delay': 0.5,
-            'timeout': 300,
-            'mouse_move_duration': 0.6,
-            'pre_click_delay': 0.4,
-            'post_click_delay': 0.8
-        }
-        
         try:
-            with open("config/settings.yaml", "w") as f:
-                yaml.dump(default_settings, f, default_flow_style=False)
+            Path("config/settings.yaml").write_bytes(_DEFAULT_SETTINGS_YAML)
             self.logger.info("Created default settings.yaml")
         except Exception as e:
             self.logger.error(f"Failed to create settings.yaml: {e}")
@@ -417,7 +795,7 @@ class KatanaGUI:
         log_frame = tk.Frame(control_container, bg='#ecf0f1')
         log_frame.pack(fill=tk.BOTH, expand=True)
         
-        self.log_text = tk.Text(log_frame, wrap=tk.WORD, 
+        self.log_text = ReadOnlyText(log_frame, wrap=tk.WORD, 
                                font=('Consolas', 9), bg='#2c3e50', fg='#ecf0f1',
                                relief=tk.FLAT, bd=1)
         self.log_text.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
@@ -575,16 +953,7 @@ class KatanaGUI:
         output_dir.mkdir(parents=True, exist_ok=True)
         
         try:
-            import subprocess
-            import platform
-            
-            if platform.system() == "Windows":
-                subprocess.run(['explorer', str(output_dir.resolve())])
-            elif platform.system() == "Darwin":  # macOS
-                subprocess.run(['open', str(output_dir.resolve())])
-            else:  # Linux
-                subprocess.run(['xdg-open', str(output_dir.resolve())])
-                
+            _open_in_explorer(output_dir)
         except Exception as e:
             messagebox.showerror("Error", f"Failed to open output folder: {e}")
     
@@ -592,16 +961,7 @@ class KatanaGUI:
         """Open the current run-specific folder if available"""
         if self.current_run_folder and self.current_run_folder.exists():
             try:
-                import subprocess
-                import platform
-                
-                if platform.system() == "Windows":
-                    subprocess.run(['explorer', str(self.current_run_folder.resolve())])
-                elif platform.system() == "Darwin":  # macOS
-                    subprocess.run(['open', str(self.current_run_folder.resolve())])
-                else:  # Linux
-                    subprocess.run(['xdg-open', str(self.current_run_folder.resolve())])
-                    
+                _open_in_explorer(self.current_run_folder)
             except Exception as e:
                 messagebox.showerror("Error", f"Failed to open run folder: {e}")
         else:
@@ -617,8 +977,7 @@ class KatanaGUI:
             self.game_listbox.insert(tk.END, "No games found")
             return
         
-        for game_name in sorted(self.games.keys()):
-            self.game_listbox.insert(tk.END, game_name)
+        self.game_listbox.insert(tk.END, *sorted(self.games))
 
     def refresh_games(self):
         """Refresh the list of installed games"""
@@ -648,23 +1007,21 @@ class KatanaGUI:
             if game_name == "No games found":
                 return
                 
-            self.selected_game = self.games.get(game_name)
+            self.selected_game = sg = self.games.get(game_name)
             
-            if self.selected_game:
+            if sg:
                 # Update details
                 self.details_text.config(state=tk.NORMAL)
                 self.details_text.delete(1.0, tk.END)
                 
-                details = f"Name: {game_name}\n"
-                details += f"Platform: {self.selected_game.get('platform', 'Unknown')}\n"
-                details += f"Path: {self.selected_game.get('path', 'Unknown')}\n"
-                
-                if self.selected_game.get('platform') == 'steam':
-                    details += f"Steam App ID: {self.selected_game.get('app_id', 'Unknown')}\n"
-                
-                # Check if workflow exists
-                workflow = self.selected_game.get('config', {}).get('workflow', [])
-                details += f"Workflow steps: {len(workflow)}\n"
+                platform_name = sg.get('platform', 'Unknown')
+                app_id_line = f"Steam App ID: {sg.get('app_id', 'Unknown')}\n" if platform_name == 'steam' else ""
+                workflow = sg.get('config', {}).get('workflow', [])
+                details = (f"Name: {game_name}\n"
+                           f"Platform: {platform_name}\n"
+                           f"Path: {sg.get('path', 'Unknown')}\n"
+                           f"{app_id_line}"
+                           f"Workflow steps: {len(workflow)}\n")
                 
                 self.details_text.insert(tk.END, details)
                 self.details_text.config(state=tk.DISABLED)
@@ -677,8 +1034,11 @@ class KatanaGUI:
         
         # Test 1: Configuration loading
         try:
-            with open("config/settings.yaml", "r") as f:
-                settings = yaml.safe_load(f)
+            # Parse the whole document so syntax errors anywhere in it fail the test
+            with open("config/settings.yaml", "rb") as f:
+                settings = yaml.load(f, Loader=_SafeLoader)
+            if not isinstance(settings, dict):
+                raise ValueError("settings.yaml is not a mapping")
             test_results.append("✓ Settings loaded successfully")
         except Exception as e:
             test_results.append(f"✗ Settings error: {e}")
@@ -709,11 +1069,8 @@ class KatanaGUI:
         
         # Test 3: Directory structure
         dirs_to_check = ["config", "config/games", "output", "output/logs", "output/screenshots", "templates/screens"]
-        for dir_path in dirs_to_check:
-            if os.path.exists(dir_path):
-                test_results.append(f"✓ Directory exists: {dir_path}")
-            else:
-                test_results.append(f"✗ Directory missing: {dir_path}")
+        test_results.extend(("✓ Directory exists: " if os.path.exists(dir_path) else "✗ Directory missing: ") + dir_path
+                            for dir_path in dirs_to_check)
         
         # Test 4: Steam path
         try:
@@ -726,12 +1083,13 @@ class KatanaGUI:
             test_results.append(f"✗ Steam path test error: {e}")
         
         # Test 5: Game configs
-        config_dir = Path("config/games")
-        if config_dir.exists():
-            config_files = list(config_dir.glob("*.yaml"))
+        config_dir = self._games_config_dir
+        if os.path.exists(config_dir):
+            with os.scandir(config_dir) as it:
+                config_files = [entry.name for entry in it
+                                if entry.name.endswith('.yaml') and entry.is_file(follow_symlinks=False)]
             test_results.append(f"✓ Found {len(config_files)} game config(s)")
-            for config_file in config_files:
-                test_results.append(f"  - {config_file.name}")
+            test_results.extend("  - " + config_file for config_file in config_files)
         else:
             test_results.append("✗ No game configs directory")
         
@@ -750,11 +1108,7 @@ class KatanaGUI:
         messagebox.showinfo("Component Test Results", result_msg)
         
         # Also log to console
-        self.log_text.config(state=tk.NORMAL)
-        self.log_text.insert(tk.END, "=== Component Test Results ===\n")
-        self.log_text.insert(tk.END, result_msg + "\n\n")
-        self.log_text.see(tk.END)
-        self.log_text.config(state=tk.DISABLED)
+        self.log_text.log_write("=== Component Test Results ===\n" + result_msg + "\n\n")
 
     def check_game_status(self):
         """Check if the selected game is running"""
@@ -789,13 +1143,15 @@ class KatanaGUI:
             messagebox.showerror("Error", "Workflow engine not initialized")
             return
         
+        config = self.selected_game['config']
+        game_name = config['name']
+        
         # Check if workflow exists
-        if not self.selected_game['config'].get('workflow'):
-            messagebox.showwarning("Warning", f"No workflow defined for {self.selected_game['config']['name']}")
+        if not config.get('workflow'):
+            messagebox.showwarning("Warning", f"No workflow defined for {game_name}")
             return
         
         # Set current game name and create run-specific logging
-        game_name = self.selected_game['config']['name']
         self.current_game_name = game_name
         run_folder = self._create_run_specific_logging(game_name)
         
@@ -805,7 +1161,7 @@ class KatanaGUI:
             self.logger.info(f"📁 Run folder created: {run_folder}")
             
             # CRITICAL: Update workflow engine's screen analyzer screenshot directory
-            if hasattr(self.workflow_engine, 'screen_analyzer') and self.workflow_engine.screen_analyzer:
+            if self._has_wf_analyzer:
                 screenshot_dir = str(run_folder / "screenshots")
                 self.workflow_engine.screen_analyzer.screenshot_dir = screenshot_dir
                 self.logger.info(f"📸 Workflow engine screenshot directory set: {screenshot_dir}")
@@ -819,68 +1175,81 @@ class KatanaGUI:
         # Clear log
         self.clear_log()
         
-        # Add a handler to update the log text widget with workflow logs
-        self.log_handler = LogTextHandler(self.log_text)
-        self.log_handler.setLevel(logging.INFO)
-        logging.getLogger().addHandler(self.log_handler)
+        # Route workflow logs to the log text widget
+        self._log_enabled.set()
         
-        # Start workflow in a separate thread
-        self.workflow_thread = threading.Thread(target=self._run_workflow)
-        self.workflow_thread.daemon = True
-        self.workflow_thread.start()
+        # Run the workflow on the background event loop
+        self.workflow_future = self._submit(self._run_workflow())
 
-    def _run_workflow(self):
-        """Run the workflow in a separate thread with enhanced logging"""
+    async def _run_workflow(self):
+        """Run the workflow on the background loop with enhanced logging"""
+        game_name = self.selected_game['config']['name']
+        after = self.root.after
+        status = self.status_var
         try:
-            game_name = self.selected_game['config']['name']
-            self.root.after(0, lambda: self.status_var.set(f"Running workflow for {game_name}..."))
+            after(0, status.set, f"Running workflow for {game_name}...")
             
             # Log workflow start with enhanced details
-            self.logger.info("=" * 80)
-            self.logger.info(f"🚀 STARTING WORKFLOW: {game_name}")
-            self.logger.info(f"📅 Start Time: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-            self.logger.info(f"📁 Run Folder: {self.current_run_folder}")
-            self.logger.info("=" * 80)
+            start = datetime.now()
+            self.logger.info("\n".join((
+                _SEP,
+                f"🚀 STARTING WORKFLOW: {game_name}",
+                f"📅 Start Time: {start.strftime(_TS_FMT)}",
+                f"📁 Run Folder: {self.current_run_folder}",
+                _SEP)))
             
             # Run the workflow
-            success = self.workflow_engine.run_workflow(self.selected_game)
+            success = await self._run_blocking(self.workflow_engine.run_workflow, self.selected_game)
             
             # Log workflow completion with enhanced details
-            self.logger.info("=" * 80)
+            self.logger.info(_SEP)
             if success:
                 self.logger.info(f"✅ WORKFLOW COMPLETED SUCCESSFULLY: {game_name}")
                 self.logger.info(f"📁 Results saved to: {self.current_run_folder}")
-                self.root.after(0, lambda: self.status_var.set(f"Workflow completed successfully for {game_name}"))
+                after(0, status.set, f"Workflow completed successfully for {game_name}")
             else:
                 self.logger.info(f"❌ WORKFLOW FAILED: {game_name}")
                 self.logger.info(f"📁 Check logs in: {self.current_run_folder}")
-                self.root.after(0, lambda: self.status_var.set(f"Workflow failed for {game_name}"))
+                after(0, status.set, f"Workflow failed for {game_name}")
             
-            self.logger.info(f"📅 End Time: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-            self.logger.info("=" * 80)
+            end = datetime.now()
+            self.logger.info(f"📅 End Time: {end.strftime(_TS_FMT)}\n{_SEP}")
         
         except Exception as e:
-            self.root.after(0, lambda: self.status_var.set("Error running workflow"))
+            after(0, status.set, "Error running workflow")
             self.logger.error(f"Error running workflow: {str(e)}")
             self.logger.error(f"📁 Check logs in: {self.current_run_folder}")
         
         finally:
             # Re-enable buttons
-            self.root.after(0, lambda: self.start_button.config(state=tk.NORMAL))
-            self.root.after(0, lambda: self.launch_button.config(state=tk.NORMAL))
-            self.root.after(0, lambda: self.close_button.config(state=tk.NORMAL))
-            self.root.after(0, lambda: self.stop_button.config(state=tk.DISABLED))
+            after(0, self._finalize_workflow_ui)
             
-            # Remove the log handler and cleanup run-specific logging
-            if hasattr(self, 'log_handler'):
-                logging.getLogger().removeHandler(self.log_handler)
+            # Stop routing logs to the widget
+            self._log_enabled.clear()
             
             # Note: Don't cleanup run logging here so logs remain accessible
             # self._cleanup_run_logging()
 
+    def _finalize_workflow_ui(self):
+        """Restore the control buttons after a workflow run"""
+        self.start_button.config(state=tk.NORMAL)
+        self.launch_button.config(state=tk.NORMAL)
+        self.close_button.config(state=tk.NORMAL)
+        if self._game_future is None or self._game_future.done():
+            self.stop_button.config(state=tk.DISABLED)
+
+    def _finalize_game_task_ui(self, button):
+        """Restore the buttons after a launch or close task"""
+        button.config(state=tk.NORMAL)
+        if self.workflow_future is None or self.workflow_future.done():
+            self.stop_button.config(state=tk.DISABLED)
+
     def stop_workflow(self):
-        """Stop the currently running workflow"""
-        if self.workflow_engine:
+        """Stop the currently running workflow and cancel a pending launch/close wait"""
+        if self._game_future is not None and not self._game_future.done():
+            self._game_future.cancel()
+            self.logger.info("Game launch/close wait cancelled")
+        if self.workflow_engine and self.workflow_future is not None and not self.workflow_future.done():
             self.workflow_engine.stop_workflow()
             self.logger.info("Workflow stop requested")
             self.status_var.set("Stopping workflow...")
@@ -896,63 +1265,70 @@ class KatanaGUI:
             return
         
         # Check if game is already running
-        process_name = self.selected_game['config'].get('process_name')
-        if self.game_controller.is_game_running(process_name):
-            messagebox.showinfo("Info", f"{self.selected_game['config']['name']} is already running")
+        config = self.selected_game['config']
+        if self.game_controller.is_game_running(config.get('process_name')):
+            messagebox.showinfo("Info", f"{config['name']} is already running")
             return
         
-        # Clear log and setup logging
+        # Clear log and route logs to the log text widget
         self.clear_log()
-        self.log_handler = LogTextHandler(self.log_text)
-        self.log_handler.setLevel(logging.INFO)
-        logging.getLogger().addHandler(self.log_handler)
+        self._log_enabled.set()
         
-        # Launch the game in a separate thread
-        threading.Thread(target=self._launch_game_thread, daemon=True).start()
+        # Launch the game on the background event loop; Stop cancels the wait
+        self._game_future = self._submit(self._launch_game_task())
+        self.stop_button.config(state=tk.NORMAL)
 
-    def _launch_game_thread(self):
-        """Launch game in a separate thread"""
+    async def _launch_game_task(self):
+        """Launch game on the background event loop"""
+        game = self.selected_game
+        config = game['config']
+        game_name = config['name']
+        after = self.root.after
+        status = self.status_var
         try:
-            game_name = self.selected_game['config']['name']
-            self.root.after(0, lambda: self.status_var.set(f"Launching {game_name}..."))
+            after(0, status.set, f"Launching {game_name}...")
             
             # Disable launch button
-            self.root.after(0, lambda: self.launch_button.config(state=tk.DISABLED))
+            after(0, self.launch_button.config, {'state': tk.DISABLED})
             
             # Launch the game
-            process = self.game_controller.launch_game(self.selected_game)
+            process = await self._run_blocking(self.game_controller.launch_game, game)
             
             if process:
                 self.logger.info(f"Game launch initiated: {game_name}")
                 
                 # Wait a bit to see if the game starts
-                process_name = self.selected_game['config'].get('process_name')
-                startup_time = self.selected_game['config'].get('startup_time', 30)
+                process_name = config.get('process_name')
+                startup_time = config.get('startup_time', 30)
                 
                 self.logger.info(f"Waiting up to {startup_time} seconds for {game_name} to start...")
                 
-                if self.game_controller.wait_for_game_to_start(startup_time, process_name):
-                    self.root.after(0, lambda: self.status_var.set(f"{game_name} launched successfully"))
-                    self.root.after(0, lambda: messagebox.showinfo("Success", f"{game_name} launched successfully!"))
+                if await self.game_controller.wait_for_game_to_start_async(startup_time, process_name):
+                    after(0, status.set, f"{game_name} launched successfully")
+                    after(0, messagebox.showinfo, "Success", f"{game_name} launched successfully!")
                 else:
-                    self.root.after(0, lambda: self.status_var.set(f"{game_name} launch may have failed"))
-                    self.root.after(0, lambda: messagebox.showwarning("Warning", f"{game_name} was launched but the process wasn't detected. Check if the game is running."))
+                    after(0, status.set, f"{game_name} launch may have failed")
+                    after(0, messagebox.showwarning, "Warning", f"{game_name} was launched but the process wasn't detected. Check if the game is running.")
             else:
-                self.root.after(0, lambda: messagebox.showerror("Error", f"Failed to launch {game_name}"))
+                after(0, messagebox.showerror, "Error", f"Failed to launch {game_name}")
                 
+        except asyncio.CancelledError:
+            self.logger.info(f"Stopped waiting for {game_name} to start")
+            after(0, status.set, "Launch wait cancelled")
+            raise
+        
         except Exception as e:
             error_msg = f"Error launching game: {str(e)}"
             self.logger.error(error_msg)
-            self.root.after(0, lambda: messagebox.showerror("Launch Error", error_msg))
-            self.root.after(0, lambda: self.status_var.set("Launch failed"))
+            after(0, messagebox.showerror, "Launch Error", error_msg)
+            after(0, status.set, "Launch failed")
         
         finally:
             # Re-enable launch button
-            self.root.after(0, lambda: self.launch_button.config(state=tk.NORMAL))
+            after(0, self._finalize_game_task_ui, self.launch_button)
             
-            # Remove the log handler
-            if hasattr(self, 'log_handler'):
-                logging.getLogger().removeHandler(self.log_handler)
+            # Stop routing logs to the widget
+            self._log_enabled.clear()
 
     def close_game(self):
         """Close the selected game"""
@@ -965,71 +1341,77 @@ class KatanaGUI:
             return
         
         # Check if game is running
-        process_name = self.selected_game['config'].get('process_name')
-        if not self.game_controller.is_game_running(process_name):
-            messagebox.showinfo("Info", f"{self.selected_game['config']['name']} is not running")
+        config = self.selected_game['config']
+        game_name = config['name']
+        if not self.game_controller.is_game_running(config.get('process_name')):
+            messagebox.showinfo("Info", f"{game_name} is not running")
             return
         
         # Ask for confirmation
-        game_name = self.selected_game['config']['name']
         if not messagebox.askyesno("Confirm", f"Are you sure you want to close {game_name}?"):
             return
         
-        # Clear log and setup logging
+        # Clear log and route logs to the log text widget
         self.clear_log()
-        self.log_handler = LogTextHandler(self.log_text)
-        self.log_handler.setLevel(logging.INFO)
-        logging.getLogger().addHandler(self.log_handler)
+        self._log_enabled.set()
         
-        # Close the game in a separate thread
-        threading.Thread(target=self._close_game_thread, daemon=True).start()
+        # Close the game on the background event loop; Stop cancels the wait
+        self._game_future = self._submit(self._close_game_task())
+        self.stop_button.config(state=tk.NORMAL)
 
-    def _close_game_thread(self):
-        """Close game in a separate thread"""
+    async def _close_game_task(self):
+        """Close game on the background event loop"""
+        config = self.selected_game['config']
+        game_name = config['name']
+        process_name = config.get('process_name')
+        controller = self.game_controller
+        after = self.root.after
+        status = self.status_var
         try:
-            game_name = self.selected_game['config']['name']
-            process_name = self.selected_game['config'].get('process_name')
-            
-            self.root.after(0, lambda: self.status_var.set(f"Closing {game_name}..."))
-            self.root.after(0, lambda: self.close_button.config(state=tk.DISABLED))
+            after(0, status.set, f"Closing {game_name}...")
+            after(0, self.close_button.config, {'state': tk.DISABLED})
             
             # Try graceful close first
-            success = self.game_controller.close_game(process_name, force=False)
+            success = await self._run_blocking(controller.close_game, process_name, False)
             
             if success:
                 self.logger.info(f"Close signal sent to {game_name}")
                 
                 # Wait for the game to close
-                if self.game_controller.wait_for_game_to_close(30, process_name):
-                    self.root.after(0, lambda: self.status_var.set(f"{game_name} closed successfully"))
-                    self.root.after(0, lambda: messagebox.showinfo("Success", f"{game_name} closed successfully"))
+                if await controller.wait_for_game_to_close_async(30, process_name):
+                    after(0, status.set, f"{game_name} closed successfully")
+                    after(0, messagebox.showinfo, "Success", f"{game_name} closed successfully")
                 else:
                     # If graceful close didn't work, try force close
                     self.logger.warning(f"Graceful close failed, trying force close for {game_name}")
-                    force_success = self.game_controller.close_game(process_name, force=True)
+                    force_success = await self._run_blocking(controller.close_game, process_name, True)
                     
                     if force_success:
-                        self.root.after(0, lambda: self.status_var.set(f"{game_name} force closed"))
-                        self.root.after(0, lambda: messagebox.showinfo("Success", f"{game_name} was force closed"))
+                        after(0, status.set, f"{game_name} force closed")
+                        after(0, messagebox.showinfo, "Success", f"{game_name} was force closed")
                     else:
-                        self.root.after(0, lambda: self.status_var.set(f"Failed to close {game_name}"))
-                        self.root.after(0, lambda: messagebox.showerror("Error", f"Failed to close {game_name}. You may need to close it manually."))
+                        after(0, status.set, f"Failed to close {game_name}")
+                        after(0, messagebox.showerror, "Error", f"Failed to close {game_name}. You may need to close it manually.")
             else:
-                self.root.after(0, lambda: messagebox.showerror("Error", f"Could not find running process for {game_name}"))
+                after(0, messagebox.showerror, "Error", f"Could not find running process for {game_name}")
                 
+        except asyncio.CancelledError:
+            self.logger.info(f"Stopped waiting for {game_name} to close")
+            after(0, status.set, "Close wait cancelled")
+            raise
+        
         except Exception as e:
             error_msg = f"Error closing game: {str(e)}"
             self.logger.error(error_msg)
-            self.root.after(0, lambda: messagebox.showerror("Close Error", error_msg))
-            self.root.after(0, lambda: self.status_var.set("Close failed"))
+            after(0, messagebox.showerror, "Close Error", error_msg)
+            after(0, status.set, "Close failed")
         
         finally:
             # Re-enable close button
-            self.root.after(0, lambda: self.close_button.config(state=tk.NORMAL))
+            after(0, self._finalize_game_task_ui, self.close_button)
             
-            # Remove the log handler
-            if hasattr(self, 'log_handler'):
-                logging.getLogger().removeHandler(self.log_handler)
+            # Stop routing logs to the widget
+            self._log_enabled.clear()
 
     # ==================== TEMPLATE METHODS (Truncated for space) ====================
     
@@ -1065,46 +1447,58 @@ class KatanaGUI:
 
     # [Additional template methods would continue here...]
     
+    def _iter_templates(self, folder):
+        """Yield DirEntry objects for the template images in a folder"""
+        with os.scandir(folder) as it:
+            for entry in it:
+                if entry.name.lower().endswith(_TEMPLATE_SUFFIXES) and entry.is_file(follow_symlinks=False):
+                    yield entry
+    
     def refresh_templates(self):
         """Refresh the template list"""
         self.template_listbox.delete(0, tk.END)
         
-        templates_dir = Path("templates/screens")
-        if not templates_dir.exists():
+        templates_dir = self._templates_dir
+        
+        # Single scandir pass over the game folders; their mtimes key the cache.
+        # A missing path or a file in its place fails here, as isdir() would
+        try:
+            with os.scandir(templates_dir) as it:
+                # Hidden and cache folders are skipped by name before any type check
+                game_dirs = [entry for entry in it
+                             if not entry.name.startswith('.') and entry.name != '__pycache__'
+                             and entry.is_dir(follow_symlinks=False)]
+            cache_key = (os.stat(templates_dir).st_mtime_ns,
+                         tuple((entry.name, entry.stat().st_mtime_ns) for entry in game_dirs))
+        except OSError:
             self.template_listbox.insert(tk.END, "No templates directory found")
             return
         
-        # Find all template files
-        template_files = []
-        for game_dir in templates_dir.iterdir():
-            if game_dir.is_dir():
-                for template_file in game_dir.glob("*.png"):
-                    relative_path = template_file.relative_to(templates_dir)
-                    template_files.append(str(relative_path))
+        if self._template_cache and self._template_cache[0] == cache_key:
+            template_files = self._template_cache[1]
+        else:
+            # Find all template files
+            template_files = []
+            for game_dir in game_dirs:
+                for template_file in self._iter_templates(game_dir.path):
+                    template_files.append(os.path.join(game_dir.name, template_file.name))
+            template_files.sort()
+            self._template_cache = (cache_key, template_files)
         
         if not template_files:
             self.template_listbox.insert(tk.END, "No template files found")
             return
         
-        for template in sorted(template_files):
-            self.template_listbox.insert(tk.END, template)
+        self.template_listbox.insert(tk.END, *template_files)
 
     def open_templates_folder(self):
         """Open the templates folder in file explorer"""
-        templates_dir = Path("templates/screens")
-        templates_dir.mkdir(parents=True, exist_ok=True)
+        templates_dir = self._templates_dir
+        if not templates_dir.exists():
+            templates_dir.mkdir(parents=True, exist_ok=True)
         
         try:
-            import subprocess
-            import platform
-            
-            if platform.system() == "Windows":
-                subprocess.run(['explorer', str(templates_dir.resolve())])
-            elif platform.system() == "Darwin":  # macOS
-                subprocess.run(['open', str(templates_dir.resolve())])
-            else:  # Linux
-                subprocess.run(['xdg-open', str(templates_dir.resolve())])
-                
+            _open_in_explorer(templates_dir)
         except Exception as e:
             messagebox.showerror("Error", f"Failed to open templates folder: {e}")
 
@@ -1119,38 +1513,20 @@ class KatanaGUI:
         if template_name in ["No templates directory found", "No template files found"]:
             return
         
-        template_path = Path("templates/screens") / template_name
+        template_path = self._templates_dir / template_name
         
         try:
-            import subprocess
-            import platform
-            
-            if platform.system() == "Windows":
-                subprocess.run(['start', str(template_path.resolve())], shell=True)
-            elif platform.system() == "Darwin":  # macOS
-                subprocess.run(['open', str(template_path.resolve())])
-            else:  # Linux
-                subprocess.run(['xdg-open', str(template_path.resolve())])
-                
+            _open_in_explorer(template_path)
         except Exception as e:
             messagebox.showerror("Error", f"Failed to open template: {e}")
 
     def open_config_folder(self):
         """Open the config folder"""
-        config_dir = Path("config")
+        config_dir = self._config_dir
         config_dir.mkdir(parents=True, exist_ok=True)
         
         try:
-            import subprocess
-            import platform
-            
-            if platform.system() == "Windows":
-                subprocess.run(['explorer', str(config_dir.resolve())])
-            elif platform.system() == "Darwin":  # macOS
-                subprocess.run(['open', str(config_dir.resolve())])
-            else:  # Linux
-                subprocess.run(['xdg-open', str(config_dir.resolve())])
-                
+            _open_in_explorer(config_dir)
         except Exception as e:
             messagebox.showerror("Error", f"Failed to open config folder: {e}")
     
@@ -1181,9 +1557,7 @@ class KatanaGUI:
 
     def clear_log(self):
         """Clear the log text widget"""
-        self.log_text.config(state=tk.NORMAL)
         self.log_text.delete(1.0, tk.END)
-        self.log_text.config(state=tk.DISABLED)
 
     def save_log(self):
         """Save the current log to a file"""
@@ -1194,13 +1568,22 @@ class KatanaGUI:
             filepath = filedialog.asksaveasfilename(
                 defaultextension=".txt",
                 filetypes=[("Text files", "*.txt"), ("All files", "*.*")],
-                initialname=filename
+                initialdir=self._last_save_dir,
+                initialfile=filename
             )
             
             if filepath:
-                log_content = self.log_text.get(1.0, tk.END)
-                with open(filepath, 'w') as f:
-                    f.write(log_content)
+                self._last_save_dir = os.path.dirname(filepath)
+                
+                # Encode once and hand the whole log to a single write() call
+                data = self.log_text.get("1.0", "end-1c").encode("utf-8")
+                fd = os.open(filepath, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, 'O_BINARY', 0), 0o644)
+                try:
+                    view = memoryview(data)
+                    while view:
+                        view = view[os.write(fd, view):]
+                finally:
+                    os.close(fd)
                 messagebox.showinfo("Success", f"Log saved to {filepath}")
                 
         except Exception as e:
@@ -1225,7 +1608,7 @@ class KatanaGUI:
         
         try:
             # Create game-specific template directory
-            template_dir = Path("templates/screens") / game_name.lower().replace(" ", "_")
+            template_dir = self._templates_dir / game_name.lower().replace(" ", "_")
             template_dir.mkdir(parents=True, exist_ok=True)
             
             messagebox.showinfo("Capture Template", 
@@ -1247,8 +1630,10 @@ class KatanaGUI:
             screen = self.screen_analyzer.capture_screen()
             
             # Save the screenshot
-            import cv2
-            success = cv2.imwrite(str(template_path), screen)
+            if cv2 is None:
+                raise ImportError("OpenCV (cv2) is required to save templates")
+            # Fast zlib level; templates are one-shot captures, not archival images
+            success = cv2.imwrite(str(template_path), screen, [cv2.IMWRITE_PNG_COMPRESSION, 1])
             
             if success:
                 messagebox.showinfo("Success", 
@@ -1272,7 +1657,7 @@ class KatanaGUI:
         # Get template file
         template_file = filedialog.askopenfilename(
             title="Select Template to Test",
-            initialdir="templates/screens",
+            initialdir=str(self._templates_dir),
             filetypes=[("PNG files", "*.png"), ("All files", "*.*")]
         )
         
@@ -1298,43 +1683,46 @@ class KatanaGUI:
             # Show countdown dialog
             countdown_dialog = self._show_countdown_dialog()
             
-            # Start the switching process in a thread
-            threading.Thread(
-                target=self._template_test_with_switch_thread, 
-                args=(template_file, countdown_dialog), 
-                daemon=True
-            ).start()
+            # Decode the template in the background so it is cached before the test runs
+            if cv2 is not None:
+                self._loop.call_soon_threadsafe(self._loop.run_in_executor, None,
+                                                self._load_template, template_file)
+            
+            # Wait 2 seconds, then Alt+Tab
+            self.root.after(2000, self._countdown_switch, template_file, countdown_dialog)
             
         except Exception as e:
             messagebox.showerror("Error", f"Template test failed: {e}")
 
-    def _template_test_with_switch_thread(self, template_file, countdown_dialog):
-        """Run template test with Alt+Tab in separate thread"""
+    def _countdown_switch(self, template_file, countdown_dialog):
+        """Switch to the game with Alt+Tab and start the countdown to the test"""
+        if not countdown_dialog.winfo_exists():
+            return  # Cancelled
+        
+        self._update_countdown(countdown_dialog, "Switching to game...")
         try:
-            # Wait 2 seconds, then Alt+Tab
-            time.sleep(2)
-            
-            # Update countdown
-            self.root.after(0, lambda: self._update_countdown(countdown_dialog, "Switching to game..."))
-            
-            # Simulate Alt+Tab to switch to game
             import pyautogui
             pyautogui.hotkey('alt', 'tab')
-            
-            # Wait 3 more seconds for game to come to foreground
-            for i in range(3, 0, -1):
-                self.root.after(0, lambda i=i: self._update_countdown(countdown_dialog, f"Testing in {i} seconds..."))
-                time.sleep(1)
-            
-            # Close countdown dialog
-            self.root.after(0, lambda: countdown_dialog.destroy())
-            
-            # Now test the template
-            self.root.after(0, lambda: self._test_template_immediate(template_file))
-            
         except Exception as e:
-            self.root.after(0, lambda: countdown_dialog.destroy())
-            self.root.after(0, lambda: messagebox.showerror("Error", f"Template test failed: {e}"))
+            countdown_dialog.destroy()
+            messagebox.showerror("Error", f"Template test failed: {e}")
+            return
+        
+        # Wait 3 more seconds for game to come to foreground
+        self._countdown_step(template_file, countdown_dialog, 3)
+
+    def _countdown_step(self, template_file, countdown_dialog, remaining):
+        """Show the seconds left, then close the countdown and run the test"""
+        if not countdown_dialog.winfo_exists():
+            return  # Cancelled
+        
+        if remaining > 0:
+            self._update_countdown(countdown_dialog, f"Testing in {remaining} seconds...")
+            self.root.after(1000, self._countdown_step, template_file, countdown_dialog, remaining - 1)
+            return
+        
+        countdown_dialog.destroy()
+        self._test_template_immediate(template_file)
 
     def _show_countdown_dialog(self):
         """Show countdown dialog during template test"""
@@ -1374,40 +1762,14 @@ class KatanaGUI:
     def _test_template_immediate(self, template_file):
         """Test template against current screen immediately"""
         try:
-            # Get threshold from settings
-            threshold = 0.8
-            if hasattr(self, 'screen_analyzer') and hasattr(self.screen_analyzer, 'threshold'):
-                threshold = self.screen_analyzer.threshold
-            
-            # Test the template with lower thresholds for detailed analysis
-            results = []
-            thresholds_to_try = [0.9, 0.8, 0.7, 0.6, 0.5]
-            
-            for test_threshold in thresholds_to_try:
-                matched, location = self.screen_analyzer.match_template(
-                    template_file, 
-                    threshold=test_threshold
-                )
-                
-                if matched:
-                    # Get the actual confidence score
-                    confidence = self._get_template_confidence(template_file)
-                    results.append({
-                        'threshold': test_threshold,
-                        'matched': True,
-                        'location': location,
-                        'confidence': confidence
-                    })
-                    break  # Found match, no need to try lower thresholds
-                else:
-                    # Get confidence even if no match
-                    confidence = self._get_template_confidence(template_file)
-                    results.append({
-                        'threshold': test_threshold,
-                        'matched': False,
-                        'location': None,
-                        'confidence': confidence
-                    })
+            # One capture and one match; every threshold row is a compare against the same score
+            confidence, location = self._match_template(template_file)
+            results = [{
+                'threshold': test_threshold,
+                'matched': confidence >= test_threshold,
+                'location': location if confidence >= test_threshold else None,
+                'confidence': confidence
+            } for test_threshold in _TEST_THRESHOLDS]
             
             # Show comprehensive results
             self._show_template_test_results(template_file, results)
@@ -1415,39 +1777,149 @@ class KatanaGUI:
         except Exception as e:
             messagebox.showerror("Error", f"Template test failed: {e}")
 
+    def _load_template(self, template_file, max_entries=32):
+        """Return (grayscale template, (height, width), pyramid, prepared) for a template file
+        
+        The file is decoded only when it changed. prepared starts empty and collects forms of
+        the template reused across polls: _dft_ncc adds its DFT for each screen size it is
+        matched against, and the GPU paths their uploads under 'gpu' and 'umat'. Templates with
+        transparent pixels get 'masks', a pyramid of their alpha mask; matching then ignores
+        those pixels (TM_CCOEFF_NORMED accepts a mask since OpenCV 4.x).
+        """
+        try:
+            key = (template_file, os.stat(template_file).st_mtime_ns)
+        except OSError:
+            return None, (0, 0), (), None
+        cache = self._template_image_cache
+        with self._template_image_lock:
+            entry = cache.get(key)
+            if entry is not None:
+                cache.move_to_end(key)
+                return entry
+        
+        # Same decoding as the engine's ScreenAnalyzer.match_template, so the
+        # confidence shown here is what a workflow step will see
+        template, mask = self.screen_analyzer.read_template(template_file)
+        if template is None:
+            return None, (0, 0), (), None
+        
+        prepared = {}
+        if mask is not None:
+            prepared['masks'] = _build_pyramid(mask)
+        
+        pyramid = _build_pyramid(template)
+        if 'masks' in prepared:
+            del prepared['masks'][len(pyramid):]
+        entry = (template, template.shape[:2], pyramid, prepared)
+        with self._template_image_lock:
+            # Another thread may have decoded the same file meanwhile; keep its entry
+            entry = cache.setdefault(key, entry)
+            cache.move_to_end(key)
+            if len(cache) > max_entries:
+                cache.popitem(last=False)
+        return entry
+
+    def _match_buffers(self):
+        """Return the calling thread's reusable DFT and NCC result buffers"""
+        bufs = getattr(self._dft_buf, 'bufs', None)
+        if bufs is None:
+            bufs = self._dft_buf.bufs = {}
+        return bufs
+
     def _get_template_confidence(self, template_file):
         """Get the actual confidence score for template matching"""
+        return self._match_template(template_file)[0]
+
+    def _match_template(self, template_file, screen=None):
+        """Return (confidence, global match center) for a template against a frame or the current screen"""
         try:
-            import cv2
-            
-            # Load template
-            template = cv2.imread(template_file)
-            if template is None:
-                return 0.0
-            
-            # Capture current screen
-            screen = self.screen_analyzer.capture_screen()
+            # Capture current screen; matching runs on single-channel images
+            if screen is None:
+                screen = self.screen_analyzer.capture_screen(gray=True)
             
-            # Ensure template isn't larger than screen
-            if template.shape[0] > screen.shape[0] or template.shape[1] > screen.shape[1]:
-                return 0.0
+            confidence, max_loc, template_shape = self._locate_template(template_file, screen)
+            if max_loc is None:
+                return confidence, None
             
-            # Perform template matching
-            result = cv2.matchTemplate(screen, template, cv2.TM_CCOEFF_NORMED)
-            min_val, max_val, min_loc, max_loc = cv2.minMaxLoc(result)
-            
-            return max_val
+            return confidence, self.screen_analyzer.match_center(max_loc, template_shape)
             
         except Exception as e:
             self.logger.error(f"Error getting template confidence: {e}")
-            return 0.0
+            return 0.0, None
+
+    def _locate_template(self, template_file, screen, near=None, floor=None):
+        """Return (confidence, local top-left, template shape) for a template on a captured frame
+        
+        With near set to the top-left of a previous match, only a window reaching twice
+        the template size around it is searched instead of the whole frame. With floor set,
+        a frame whose downsampled score is already below it returns None for the confidence
+        and location.
+        """
+        if cv2 is None:
+            raise ImportError("OpenCV (cv2) is required for template matching")
+        
+        # Load template (cached across polls)
+        template, (template_h, template_w), pyramid, prepared = self._load_template(template_file)
+        if template is None:
+            return 0.0, None, (0, 0)
+        
+        if screen.ndim == 3:
+            screen = cv2.cvtColor(screen, cv2.COLOR_BGR2GRAY)
+        
+        x0 = y0 = 0
+        if near is not None:
+            radius = max(template_h, template_w) * 2
+            x0 = max(near[0] - radius, 0)
+            y0 = max(near[1] - radius, 0)
+            screen = screen[y0:near[1] + radius + template_h, x0:near[0] + radius + template_w]
+        
+        # Ensure template isn't larger than screen
+        if template_h > screen.shape[0] or template_w > screen.shape[1]:
+            return 0.0, None, (template_h, template_w)
+        
+        masks = prepared.get('masks')
+        if near is not None:
+            max_val, (x, y) = _full_match(screen, template, self._match_buffers(),
+                                          mask=masks[0] if masks else None, dft=False, role='near')
+            return max_val, (x0 + x, y0 + y), (template_h, template_w)
+        
+        # Exact full-resolution match on the GPU when available, else coarse-to-fine on the CPU;
+        # the GPU paths take no mask
+        if self._use_cuda and masks is None:
+            max_val, max_loc = self._cuda_match(screen, template, prepared)
+        elif self.screen_analyzer.use_opencl and masks is None:
+            max_val, max_loc = _umat_match(screen, template, prepared)
+        else:
+            max_val, max_loc = _pyramid_match(screen, pyramid, self._match_buffers(), prepared, masks, floor)
+        return max_val, max_loc, (template_h, template_w)
+
+    def _cuda_match(self, screen, template, prepared):
+        """TM_CCOEFF_NORMED on the GPU, returning (max_val, max_loc)
+        
+        The template is uploaded once per cache entry; the matcher and the screen's GpuMat
+        are kept per thread so their device allocations are reused across polls.
+        """
+        template_gpu = prepared.get('gpu')
+        if template_gpu is None:
+            template_gpu = cv2.cuda_GpuMat()
+            template_gpu.upload(template)
+            prepared['gpu'] = template_gpu
+        
+        state = self._gpu_local
+        if getattr(state, 'matcher', None) is None:
+            state.matcher = cv2.cuda.createTemplateMatching(cv2.CV_8UC1, cv2.TM_CCOEFF_NORMED)
+            state.screen = cv2.cuda_GpuMat()
+        state.screen.upload(np.ascontiguousarray(screen))
+        result = state.matcher.match(state.screen, template_gpu)
+        _, max_val, _, max_loc = cv2.cuda.minMaxLoc(result)
+        return max_val, max_loc
 
     def _show_template_test_results(self, template_file, results):
         """Show detailed template test results"""
         template_name = Path(template_file).name
         
         # Find the best result
-        best_result = max(results, key=lambda x: x['confidence'])
+        best_result = max(results, key=lambda x: (x['confidence'], x['matched']))
         
         # Create results dialog
         results_dialog = tk.Toplevel(self.root)
@@ -1569,7 +2041,7 @@ class KatanaGUI:
         # Get template file
         template_file = filedialog.askopenfilename(
             title="Select Template to Monitor",
-            initialdir="templates/screens",
+            initialdir=str(self._templates_dir),
             filetypes=[("PNG files", "*.png"), ("All files", "*.*")]
         )
         
@@ -1820,125 +2292,263 @@ class KatanaGUI:
         ttk.Button(button_frame, text="📸 Take Reference", 
                   command=take_reference).pack(side=tk.LEFT)
         
-        # Start monitoring in separate thread
+        # Monitoring is driven from the Tk loop; each poll's matching runs on this
+        # monitor's own single worker thread so the dialog stays responsive
+        self._begin_monitoring({
+            'template_file': template_file,
+            'template_name': template_name,
+            'params': params,
+            'status_label': status_label,
+            'log_text': log_text,
+            'widgets': (confidence_label, match_label, progress_var, log_text),
+            'stop': stop_monitoring,
+            'executor': ThreadPoolExecutor(max_workers=1),
+            'detection_count': 0,
+            'total_polls': 0,
+            'best_confidence': None,
+            'last_loc': None,
+            'pending_log': [],
+            'polls_since_flush': 0,
+            'last_flush': 0.0
+        })
+
+    def _begin_monitoring(self, ctx):
+        """Start a monitoring session, switching to the game first if requested"""
+        if ctx['params']['switch_to_game']:
+            ctx['status_label'].config(text="🔄 Switching to game...")
+            self.root.after(2000, self._switch_to_game_then_monitor, ctx)
+        else:
+            self._monitoring_started(ctx)
+
+    def _switch_to_game_then_monitor(self, ctx):
+        """Alt-tab to the game and start polling once it has had time to come forward"""
+        try:
+            import pyautogui
+            pyautogui.hotkey('alt', 'tab')
+        except Exception as e:
+            ctx['executor'].shutdown(wait=False)
+            timestamp = time.strftime("%H:%M:%S")
+            self._append_monitor_log(ctx['log_text'], f"❌ {timestamp} - Monitoring failed: {str(e)}\n")
+            return
+        self.root.after(3000, self._monitoring_started, ctx)
+
+    def _monitoring_started(self, ctx):
+        """Start the frame producer and the first poll"""
+        if ctx['stop'][0]:
+            ctx['executor'].shutdown(wait=False)
+            return
+        
+        params = ctx['params']
+        poll_interval = params['poll_interval']
+        
+        # After switching to the game only its window is captured
+        box = _active_window_box() if params['switch_to_game'] else None
+        
+        # Frames are grabbed on their own thread into a one-slot queue, so the
+        # next capture is already in flight while the worker is matching
+        ctx['frame_slot'] = queue.Queue(maxsize=1)
+        ctx['capture_stop'] = threading.Event()
         threading.Thread(
-            target=self._template_monitoring_thread,
-            args=(template_file, params, monitor_dialog, status_label, confidence_label, 
-                  match_label, progress_var, log_text, stop_monitoring),
+            target=self._capture_frames,
+            args=(ctx['frame_slot'], poll_interval, ctx['capture_stop'], box),
             daemon=True
         ).start()
+        ctx['start_time'] = ctx['last_flush'] = time.monotonic()
+        
+        timestamp = time.strftime("%H:%M:%S")
+        try:
+            ctx['status_label'].config(text="👁️ Monitoring active...")
+        except tk.TclError:
+            pass
+        self._append_monitor_log(ctx['log_text'],
+            f"🔍 {timestamp} - Started monitoring {ctx['template_name']}\n"
+            f"⚙️ {timestamp} - Poll: {poll_interval}s, Duration: {params['duration']}s, "
+            f"Threshold: {params['threshold']:.2f}\n\n")
+        self._poll_once(ctx)
+
+    def _poll_once(self, ctx):
+        """Hand the next poll to the monitor's worker, or finish once stopped or out of time"""
+        if ctx['stop'][0] or time.monotonic() - ctx['start_time'] >= ctx['params']['duration']:
+            self._finish_monitoring(ctx)
+            return
+        future = ctx['executor'].submit(self._monitor_poll, ctx)
+        future.add_done_callback(lambda f: self.root.after(0, self._poll_done, ctx, f))
 
-    def _template_monitoring_thread(self, template_file, params, dialog, status_label, 
-                                   confidence_label, match_label, progress_var, log_text, stop_monitoring):
-        """Run template monitoring in separate thread"""
+    def _monitor_poll(self, ctx):
+        """Wait for the latest frame and match it, returning (confidence, location) or None without a frame
+        
+        confidence is None when the frame was rejected by the downsampled search alone.
+        """
+        poll_interval = ctx['params']['poll_interval']
+        threshold = ctx['params']['threshold']
+        template_file = ctx['template_file']
         try:
-            template_name = Path(template_file).name
-            poll_interval = params['poll_interval']
-            duration = params['duration']
-            threshold = params['threshold']
-            switch_to_game = params['switch_to_game']
-            
-            # Switch to game if requested
-            if switch_to_game:
-                self.root.after(0, lambda: status_label.config(text="🔄 Switching to game..."))
-                time.sleep(2)
-                
-                import pyautogui
-                pyautogui.hotkey('alt', 'tab')
-                time.sleep(3)
-            
-            # Start monitoring
-            start_time = time.time()
-            detection_count = 0
-            total_polls = 0
-            best_confidence = 0
-            
-            self.root.after(0, lambda: status_label.config(text="👁️ Monitoring active..."))
-            self.root.after(0, lambda: log_text.insert(tk.END, f"🔍 {datetime.now().strftime('%H:%M:%S')} - Started monitoring {template_name}\n"))
-            self.root.after(0, lambda: log_text.insert(tk.END, f"⚙️ {datetime.now().strftime('%H:%M:%S')} - Poll: {poll_interval}s, Duration: {duration}s, Threshold: {threshold:.2f}\n\n"))
-            
-            while time.time() - start_time < duration and not stop_monitoring[0]:
+            screen = ctx['frame_slot'].get(timeout=max(poll_interval * 2, 1.0))
+        except queue.Empty:
+            return None
+        if isinstance(screen, Exception):
+            raise screen
+        
+        # Search around the last match first
+        confidence, loc = None, None
+        if ctx['last_loc'] is not None:
+            confidence, loc, _ = self._locate_template(template_file, screen, ctx['last_loc'])
+        if confidence is None or confidence < threshold:
+            # Frames that are clearly not a match stop at the downsampled search, which
+            # gives no full-size confidence; keep the local search's score if there was one
+            full_confidence, full_loc, _ = self._locate_template(template_file, screen,
+                                                                 floor=threshold - _PYR_SLACK)
+            if full_confidence is not None:
+                confidence, loc = full_confidence, full_loc
+        return confidence, loc
+
+    def _poll_done(self, ctx, future):
+        """Record a finished poll in the dialog and schedule the next one"""
+        timestamp = time.strftime("%H:%M:%S")
+        try:
+            result = future.result()
+        except Exception as e:
+            ctx['pending_log'].append(f"⚠️ {timestamp} - Error: {str(e)}\n")
+            result = None
+        
+        if result is not None:
+            confidence, loc = result
+            threshold = ctx['params']['threshold']
+            detected = confidence is not None and confidence >= threshold
+            ctx['last_loc'] = loc if detected else None
+            ctx['total_polls'] += 1
+            # Coarse-only rejections have no full-size score to report
+            if confidence is not None and (ctx['best_confidence'] is None
+                                           or confidence > ctx['best_confidence']):
+                ctx['best_confidence'] = confidence
+            if detected:
+                ctx['detection_count'] += 1
+            
+            # Log significant events; lines are flushed to the dialog at most
+            # once a second or every 5 polls, the labels update every poll
+            if confidence is None:
+                confidence_text = "n/a (no match)"
+            else:
+                confidence_text = f"{confidence * 100:.1f}%"
+            if detected:
+                ctx['pending_log'].append(f"✅ {timestamp} - DETECTED! Confidence: {confidence_text}\n")
+            elif confidence is not None and confidence > 0.5:  # Log near misses
+                ctx['pending_log'].append(f"🟡 {timestamp} - Near miss: {confidence_text}\n")
+            
+            now = time.monotonic()
+            ctx['polls_since_flush'] += 1
+            log_line = None
+            if ctx['polls_since_flush'] >= 5 or now - ctx['last_flush'] >= 1.0:
+                log_line = self._take_pending_log(ctx)
+            
+            elapsed = now - ctx['start_time']
+            self._apply_monitor_update(ctx['widgets'], {
+                'progress': (elapsed / ctx['params']['duration']) * 100,
+                'confidence': f"Confidence: {confidence_text}",
+                'color': "#27ae60" if detected else "#e74c3c",
+                'status': "✅ DETECTED!" if detected else "❌ Not detected",
+                'log_line': log_line
+            })
+        elif ctx['pending_log'] and time.monotonic() - ctx['last_flush'] >= 1.0:
+            self._append_monitor_log(ctx['log_text'], self._take_pending_log(ctx))
+        
+        self._poll_once(ctx)
+
+    def _finish_monitoring(self, ctx):
+        """Stop the producer and worker and report the session summary"""
+        ctx['capture_stop'].set()
+        # Runs after any in-flight poll on the worker, releasing the MSS handle
+        # its match_center calls opened
+        ctx['executor'].submit(self.screen_analyzer.close_thread_capture)
+        ctx['executor'].shutdown(wait=False)
+        
+        duration = ctx['params']['duration']
+        total_polls = ctx['total_polls']
+        detection_count = ctx['detection_count']
+        best_confidence = ctx['best_confidence']
+        best_text = "n/a" if best_confidence is None else f"{best_confidence*100:.1f}%"
+        detection_rate = (detection_count / total_polls * 100) if total_polls > 0 else 0
+        
+        try:
+            ctx['status_label'].config(text="✅ Monitoring complete")
+        except tk.TclError:
+            pass
+        self._append_monitor_log(ctx['log_text'],
+            f"{self._take_pending_log(ctx)}"
+            f"\n📊 MONITORING SUMMARY:\n"
+            f"   Duration: {duration}s\n"
+            f"   Total polls: {total_polls}\n"
+            f"   Detections: {detection_count}\n"
+            f"   Detection rate: {detection_rate:.1f}%\n"
+            f"   Best confidence: {best_text}\n")
+        
+        # Show summary dialog
+        if not ctx['stop'][0]:
+            summary_msg = (f"👁️ Monitoring Complete!\n\n"
+                         f"Template: {ctx['template_name']}\n"
+                         f"Duration: {duration}s\n"
+                         f"Detections: {detection_count}/{total_polls} polls\n"
+                         f"Detection rate: {detection_rate:.1f}%\n"
+                         f"Best confidence: {best_text}")
+            messagebox.showinfo("Monitoring Complete", summary_msg)
+
+    def _take_pending_log(self, ctx):
+        """Return and clear the monitoring log lines not yet written to the dialog"""
+        text = "".join(ctx['pending_log'])
+        ctx['pending_log'].clear()
+        ctx['polls_since_flush'] = 0
+        ctx['last_flush'] = time.monotonic()
+        return text
+
+    def _append_monitor_log(self, log_text, text):
+        """Append text to a monitoring dialog's log, ignoring dialogs that were closed"""
+        try:
+            log_text.insert(tk.END, text)
+            log_text.see(tk.END)
+        except tk.TclError:
+            pass
+
+    def _apply_monitor_update(self, widgets, s):
+        """Apply one poll's monitoring results to the dialog widgets"""
+        confidence_label, match_label, progress_var, log_text = widgets
+        try:
+            progress_var.set(s['progress'])
+            confidence_label.config(text=s['confidence'], fg=s['color'])
+            match_label.config(text=f"Status: {s['status']}", fg=s['color'])
+            if s['log_line']:
+                log_text.insert(tk.END, s['log_line'])
+                log_text.see(tk.END)
+        except tk.TclError:
+            # Dialog was closed
+            pass
+
+    def _capture_frames(self, frame_slot, poll_interval, stop_event, box=None):
+        """Grab a frame every poll_interval into frame_slot, replacing any frame not yet consumed
+        
+        With box set only that screen rectangle is grabbed. Capture errors are passed
+        through the slot so the monitoring loop reports them.
+        """
+        analyzer = self.screen_analyzer
+        next_grab = time.monotonic()
+        try:
+            while not stop_event.is_set():
                 try:
-                    # Calculate progress
-                    elapsed = time.time() - start_time
-                    progress = (elapsed / duration) * 100
-                    self.root.after(0, lambda p=progress: progress_var.set(p))
-                    
-                    # Get confidence
-                    confidence = self._get_template_confidence(template_file)
-                    total_polls += 1
-                    
-                    if confidence > best_confidence:
-                        best_confidence = confidence
-                    
-                    # Check if detected
-                    detected = confidence >= threshold
-                    if detected:
-                        detection_count += 1
-                    
-                    # Update UI
-                    confidence_percent = confidence * 100
-                    self.root.after(0, lambda c=confidence_percent: confidence_label.config(
-                        text=f"Confidence: {c:.1f}%",
-                        fg="#27ae60" if c >= threshold * 100 else "#e74c3c"
-                    ))
-                    
-                    status_text = "✅ DETECTED!" if detected else "❌ Not detected"
-                    status_color = "#27ae60" if detected else "#e74c3c"
-                    self.root.after(0, lambda s=status_text, c=status_color: match_label.config(
-                        text=f"Status: {s}", fg=c
-                    ))
-                    
-                    # Log significant events
-                    if detected:
-                        timestamp = datetime.now().strftime("%H:%M:%S")
-                        self.root.after(0, lambda t=timestamp, c=confidence_percent: log_text.insert(
-                            tk.END, f"✅ {t} - DETECTED! Confidence: {c:.1f}%\n"
-                        ))
-                        self.root.after(0, lambda: log_text.see(tk.END))
-                    elif confidence > 0.5:  # Log near misses
-                        timestamp = datetime.now().strftime("%H:%M:%S")
-                        self.root.after(0, lambda t=timestamp, c=confidence_percent: log_text.insert(
-                            tk.END, f"🟡 {t} - Near miss: {c:.1f}%\n"
-                        ))
-                        self.root.after(0, lambda: log_text.see(tk.END))
-                    
-                    # Wait for next poll
-                    time.sleep(poll_interval)
-                    
+                    if box is not None:
+                        frame = analyzer.capture_box(box, gray=True)
+                    else:
+                        frame = analyzer.capture_screen(gray=True)
                 except Exception as e:
-                    timestamp = datetime.now().strftime("%H:%M:%S")
-                    self.root.after(0, lambda t=timestamp, err=str(e): log_text.insert(tk.END, f"⚠️ {t} - Error: {err}\n"))
-                    self.root.after(0, lambda: log_text.see(tk.END))
-                    time.sleep(poll_interval)
-            
-            # Monitoring complete
-            detection_rate = (detection_count / total_polls * 100) if total_polls > 0 else 0
-            
-            self.root.after(0, lambda: status_label.config(text="✅ Monitoring complete"))
-            self.root.after(0, lambda: log_text.insert(tk.END, f"\n📊 MONITORING SUMMARY:\n"))
-            self.root.after(0, lambda: log_text.insert(tk.END, f"   Duration: {duration}s\n"))
-            self.root.after(0, lambda: log_text.insert(tk.END, f"   Total polls: {total_polls}\n"))
-            self.root.after(0, lambda: log_text.insert(tk.END, f"   Detections: {detection_count}\n"))
-            self.root.after(0, lambda: log_text.insert(tk.END, f"   Detection rate: {detection_rate:.1f}%\n"))
-            self.root.after(0, lambda: log_text.insert(tk.END, f"   Best confidence: {best_confidence*100:.1f}%\n"))
-            self.root.after(0, lambda: log_text.see(tk.END))
-            
-            # Show summary dialog
-            if not stop_monitoring[0]:
-                summary_msg = (f"👁️ Monitoring Complete!\n\n"
-                             f"Template: {template_name}\n"
-                             f"Duration: {duration}s\n"
-                             f"Detections: {detection_count}/{total_polls} polls\n"
-                             f"Detection rate: {detection_rate:.1f}%\n"
-                             f"Best confidence: {best_confidence*100:.1f}%")
+                    frame = e
+                try:
+                    frame_slot.get_nowait()
+                except queue.Empty:
+                    pass
+                frame_slot.put(frame)
                 
-                self.root.after(0, lambda: messagebox.showinfo("Monitoring Complete", summary_msg))
-            
-        except Exception as e:
-            timestamp = datetime.now().strftime("%H:%M:%S")
-            self.root.after(0, lambda t=timestamp: log_text.insert(tk.END, f"❌ {t} - Monitoring failed: {str(e)}\n"))
-            self.root.after(0, lambda: log_text.see(tk.END))
+                next_grab += poll_interval
+                stop_event.wait(max(next_grab - time.monotonic(), 0))
+        finally:
+            analyzer.close_thread_capture()
 
     def _show_choice_dialog(self, title, message, choices):
         """Show a dialog with multiple choices"""
@@ -1982,69 +2592,366 @@ class KatanaGUI:
         
         return result[0]
     
+    def _on_root_configure(self, event):
+        """Forget cached monitor geometry when the main window itself is reconfigured"""
+        if event.widget is self.root:
+            self._monitor_cache = None
+
     def test_monitor_detection(self):
         """Test and display monitor information"""
+        # mss setup can block on the display server, so enumerate off the UI thread
+        threading.Thread(target=self._enumerate_monitors_worker, daemon=True).start()
+    
+    def _enumerate_monitors_worker(self):
+        """Build the monitor summary in a worker thread and show it on the main thread"""
         try:
-            import mss
-            import tkinter as tk
-            from tkinter import messagebox
-            
-            with mss.mss() as sct:
-                monitor_info = []
+            cached = self._monitor_cache
+            if cached is not None and time.monotonic() - cached[0] < _MONITOR_TTL:
+                monitors = cached[1]
+            else:
+                import mss
+                with mss.mss() as sct:
+                    # Skip the "all monitors" entry
+                    monitors = [dict(m) for m in sct.monitors[1:]]
+                self._monitor_cache = (time.monotonic(), monitors)
+            
+            monitor_info = []
+            for i, monitor in enumerate(monitors, 1):
+                width = monitor['width']
+                height = monitor['height']
+                left = monitor['left']
+                top = monitor['top']
                 
-                for i, monitor in enumerate(sct.monitors):
-                    if i == 0:  # Skip the "all monitors" entry
-                        continue
-                        
-                    width = monitor['width']
-                    height = monitor['height']
-                    left = monitor['left']
-                    top = monitor['top']
-                    
-                    monitor_info.append(f"Monitor {i}:")
-                    monitor_info.append(f"  Resolution: {width}x{height}")
-                    monitor_info.append(f"  Position: ({left}, {top})")
-                    monitor_info.append(f"  Right edge: {left + width}")
-                    monitor_info.append(f"  Bottom edge: {top + height}")
-                    monitor_info.append("")
-            
-            messagebox.showinfo("Monitor Information", "\n".join(monitor_info))
-
+                monitor_info.append(
+                    f"Monitor {i}:\n  Resolution: {width}x{height}\n"
+                    f"  Position: ({left}, {top})\n"
+                    f"  Right edge: {left + width}\n  Bottom edge: {top + height}\n"
+                )
             
+            text = "\n".join(monitor_info)
+            self.root.after(0, self._show_monitor_info, text)
             
         except Exception as e:
-            messagebox.showerror("Error", f"Failed to detect monitors: {e}")
+            error = f"Failed to detect monitors: {e}"
+            self.root.after(0, lambda: messagebox.showerror("Error", error))
+
+    
+    def _show_monitor_info(self, text):
+        """Show the monitor summary in a fixed-size, non-modal window"""
+        dialog = tk.Toplevel(self.root)
+        dialog.title("Monitor Information")
+        dialog.transient(self.root)
+        dialog.geometry("+%d+%d" % (self.root.winfo_rootx() + 50, self.root.winfo_rooty() + 50))
+        
+        main_frame = ttk.Frame(dialog, padding=10)
+        main_frame.pack(fill=tk.BOTH, expand=True)
+        
+        text_container = ttk.Frame(main_frame)
+        text_container.pack(fill=tk.BOTH, expand=True)
+        
+        # Fixed width/height so Tk doesn't size the window from the text
+        info_text = tk.Text(text_container, width=40, height=15, wrap=tk.NONE,
+                            font=('Consolas', 9))
+        info_text.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        
+        info_scroll = ttk.Scrollbar(text_container, orient=tk.VERTICAL, command=info_text.yview)
+        info_scroll.pack(side=tk.RIGHT, fill=tk.Y)
+        info_text.config(yscrollcommand=info_scroll.set)
+        
+        info_text.insert(tk.END, text)
+        info_text.config(state=tk.DISABLED)
+        
+        ttk.Button(main_frame, text="Close", command=dialog.destroy).pack(pady=(10, 0))
+        dialog.focus_set()
+
+
+class CachedTimeFormatter(logging.Formatter):
+    """Formatter that reuses the formatted date for every record in the same second
+    
+    Only the milliseconds are formatted per record; strftime runs once per second.
+    """
+    
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._cached = (None, '')
+    
+    def formatTime(self, record, datefmt=None):
+        if datefmt:
+            return super().formatTime(record, datefmt)
+        second = int(record.created)
+        cached_second, stamp = self._cached
+        if second != cached_second:
+            stamp = time.strftime(self.default_time_format, self.converter(second))
+            self._cached = (second, stamp)
+        return self.default_msec_format % (stamp, record.msecs)
+
+
+# One formatter shared by the console, session, run and GUI log handlers
+_LOG_FMT = CachedTimeFormatter("{asctime} - {name} - {levelname} - {message}", style="{")
+
+
+class BufferedFileHandler(logging.StreamHandler):
+    """File handler that writes through a 64 KiB buffer instead of flushing every record
+    
+    Buffered records are flushed on close and by logging's own shutdown hook at exit.
+    Used for the session log only; the per-run log is written unbuffered.
+    """
+    
+    def __init__(self, filename, buffer_size=1 << 16):
+        super().__init__(open(filename, 'a', encoding='utf-8', buffering=buffer_size))
+    
+    def emit(self, record):
+        try:
+            self.stream.write(self.format(record) + self.terminator)
+        except Exception:
+            self.handleError(record)
+    
+    def close(self):
+        self.acquire()
+        try:
+            try:
+                if self.stream and not self.stream.closed:
+                    self.stream.flush()
+                    self.stream.close()
+            finally:
+                super().close()
+        finally:
+            self.release()
+
+
+class ReadOnlyText(tk.Text):
+    """Text widget that rejects user edits but stays writable from code
+    
+    Avoids toggling the widget state around every programmatic insert.
+    """
+    
+    _NAVIGATION_KEYS = frozenset(('Left', 'Right', 'Up', 'Down', 'Home', 'End', 'Prior', 'Next',
+                                  'Shift_L', 'Shift_R', 'Control_L', 'Control_R',
+                                  'Meta_L', 'Meta_R'))
+    
+    # Control, plus Mod1 which Tk on macOS reports for the Command key
+    _COPY_MODIFIERS = 0x4 | 0x8
+    
+    def __init__(self, master=None, **kwargs):
+        super().__init__(master, **kwargs)
+        self.bind('<Key>', self._block_edit)
+        for sequence in ('<<Paste>>', '<<Cut>>', '<<Clear>>', '<<PasteSelection>>'):
+            self.bind(sequence, lambda e: "break")
+    
+    def _block_edit(self, event):
+        # Keep selection, copy and scrolling keys; swallow everything else
+        if event.keysym in self._NAVIGATION_KEYS:
+            return None
+        if event.state & self._COPY_MODIFIERS and event.keysym.lower() in ('c', 'a'):
+            return None
+        return "break"
+    
+    def log_write(self, text):
+        """Append text, following the end only if the view was already at the bottom
+        
+        A user who scrolled up to read earlier output keeps their position.
+        """
+        at_bottom = self.yview()[1] >= 0.999
+        self.insert(tk.END, text)
+        if at_bottom:
+            self.see(tk.END)
+
+
+class EventGateFilter(logging.Filter):
+    """Filter that passes records only while an Event is set"""
+    
+    def __init__(self, event):
+        super().__init__()
+        self.event = event
+    
+    def filter(self, record):
+        return self.event.is_set()
 
 
 class LogTextHandler(logging.Handler):
-    """Handler to redirect logging output to a tkinter Text widget"""
+    """Handler to redirect logging output to a tkinter Text widget
+    
+    emit only renders the record's message and queues it. A daemon thread formats
+    queued records in batches, at most one batch every flush_ms, and wakes the
+    main thread with a single <<LogFlush>> virtual event per pending flush, so
+    logging from a Tk callback never pays for full formatting and a burst costs
+    one main-thread callback instead of one per record. The widget keeps at most max_lines lines.
+    
+    The queue holds at most max_queued records; when it is full the oldest record
+    is dropped and a single "N log messages dropped" line is logged in its place.
+    """
     
-    def __init__(self, text_widget):
+    _BATCH_SIZE = 256
+    _CHUNK_THRESHOLD = 16384
+    _CHUNK_SIZE = 8192
+    
+    def __init__(self, text_widget, flush_ms=50, max_lines=5000, max_queued=10000):
         super().__init__()
         self.text_widget = text_widget
-        self.formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+        self._call = text_widget.tk.call
+        self._path = str(text_widget)
+        self._max_lines = max_lines
+        self.formatter = _LOG_FMT
+        self._q = queue.Queue(maxsize=max_queued)
+        self._dropped = 0
+        self._flush_interval = flush_ms / 1000
+        self._pending = deque()
+        self._posted = False
+        self._dead = False
+        text_widget.bind("<<LogFlush>>", self._drain, add="+")
+        text_widget.bind("<Destroy>", self._on_destroy, add="+")
+        threading.Thread(target=self._consume, daemon=True).start()
+    
+    def _on_destroy(self, event=None):
+        self._dead = True
     
     def emit(self, record):
-        msg = self.format(record)
-        
-        def append():
+        # Called with the handler lock held, which also guards _dropped
+        if self._dead:
+            return
+        record = self._prepare(record)
+        q = self._q
+        while True:
+            try:
+                q.put_nowait(record)
+                return
+            except queue.Full:
+                try:
+                    q.get_nowait()
+                    self._dropped += 1
+                except queue.Empty:
+                    pass
+    
+    def _prepare(self, record):
+        """Freeze a record for later formatting, as QueueHandler.prepare does
+        
+        The message and traceback are rendered now, while args and exc_info still
+        describe the moment of the call; the copy leaves other handlers' record alone.
+        """
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            if not record.exc_text:
+                record.exc_text = self.formatter.formatException(record.exc_info)
+            record.exc_info = None
+        return record
+    
+    def _consume(self):
+        """Format queued records in batches and hand each batch to the main thread"""
+        q = self._q
+        while not self._dead:
+            # While text is waiting for the main thread, wake up regularly so a
+            # failed post is retried even if nothing else gets logged
+            records = []
             try:
-                self.text_widget.config(state=tk.NORMAL)
-                self.text_widget.insert(tk.END, msg + '\n')
-                self.text_widget.see(tk.END)
-                self.text_widget.config(state=tk.DISABLED)
-            except tk.TclError:
-                # Widget has been destroyed
+                records.append(q.get(timeout=self._flush_interval if self._pending else None))
+                while len(records) < self._BATCH_SIZE:
+                    records.append(q.get_nowait())
+            except queue.Empty:
                 pass
-        
-        # Schedule the append to happen in the main thread
+            
+            self.acquire()
+            try:
+                dropped, self._dropped = self._dropped, 0
+            finally:
+                self.release()
+            if dropped:
+                records.insert(0, logging.LogRecord(__name__, logging.WARNING, __file__, 0,
+                                                    "%d log messages dropped", (dropped,), None))
+            
+            lines = []
+            for record in records:
+                try:
+                    lines.append(self.format(record))
+                except Exception:
+                    self.handleError(record)
+            
+            if lines and not self._dead:
+                self._pending.append("\n".join(lines) + "\n")
+            if self._pending and not self._dead:
+                self._post()
+            time.sleep(self._flush_interval)
+    
+    def _post(self):
+        """Wake the main thread once; _drain picks up everything pending"""
+        self.acquire()
         try:
-            self.text_widget.after(0, append)
-        except tk.TclError:
-            # Widget has been destroyed
+            post, self._posted = not self._posted, True
+        finally:
+            self.release()
+        if not post:
+            return
+        try:
+            self.text_widget.event_generate("<<LogFlush>>", when="tail")
+        except (tk.TclError, RuntimeError):
+            # Not deliverable yet (e.g. logging before mainloop has started) or
+            # the widget is gone; clear the flag so the next pass posts again
+            self.acquire()
+            try:
+                self._posted = False
+            finally:
+                self.release()
+    
+    def _drain(self, event=None):
+        """Append every pending batch to the widget (main thread)"""
+        if self._dead:
+            return
+        self.acquire()
+        try:
+            self._posted = False
+        finally:
+            self.release()
+        pending = self._pending
+        chunks = []
+        try:
+            while True:
+                chunks.append(pending.popleft())
+        except IndexError:
             pass
+        if chunks:
+            self._append("".join(chunks))
+    
+    def _append(self, text):
+        # Talk to the Tcl text command directly; this runs once per batch
+        call, path = self._call, self._path
+        at_bottom = self.text_widget.yview()[1] >= 0.999
+        if len(text) > self._CHUNK_THRESHOLD:
+            # Insert a log storm in slices and let Tk redraw between them
+            # so one huge insert can't hold up the event loop
+            size = self._CHUNK_SIZE
+            for start in range(0, len(text), size):
+                call(path, 'insert', 'end', text[start:start + size])
+                self.text_widget.update_idletasks()
+                if self._dead:
+                    return
+        else:
+            call(path, 'insert', 'end', text)
+        
+        # Keep only the newest max_lines lines so inserts and redraws stay cheap;
+        # the text ends with a newline, so the last index line is empty
+        lines = int(str(call(path, 'index', 'end-1c')).split('.')[0]) - 1
+        if lines > self._max_lines:
+            call(path, 'delete', '1.0', f'{lines - self._max_lines + 1}.0')
+        if at_bottom:
+            call(path, 'see', 'end')
 
-if __name__ == "__main__":
+def main():
+    # Keeps frozen Windows builds from re-running the GUI in any spawned child process
+    from multiprocessing import freeze_support
+    freeze_support()
+    
     root = tk.Tk()
     app = KatanaGUI(root)
-    root.mainloop()
\ No newline at end of file
+    
+    # Widgets, handlers and config live for the whole session; move them out of
+    # the collector's reach and collect less often so GC pauses don't stall the UI
+    gc.collect()
+    gc.freeze()
+    gc.set_threshold(50000, 20, 20)
+    
+    root.mainloop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+import unittest
+from types import SimpleNamespace
+from unittest import mock
+
+import yaml
+
+import workflow_builder
+from workflow_builder import WorkflowBuilder, _parse_list_param
+
+
+class _Var:
+    """Stand-in for a Tk variable or entry that only needs get()"""
+
+    def __init__(self, value):
+        self.value = value
+
+    def get(self):
+        return self.value
+
+
+class ListParamTest(unittest.TestCase):
+    def test_region_parses_as_floats(self):
+        self.assertEqual(_parse_list_param("region", "[0.1, 0.2, 0.5, 0.6]"), [0.1, 0.2, 0.5, 0.6])
+
+    def test_offset_parses_as_ints(self):
+        self.assertEqual(_parse_list_param("offset", "[10, -5]"), [10, -5])
+        with self.assertRaises(ValueError):
+            _parse_list_param("offset", "[1.5, 2]")
+
+    def test_length_is_checked(self):
+        with self.assertRaises(ValueError):
+            _parse_list_param("region", "[0.1, 0.2, 0.5]")
+
+    def test_region_round_trips_through_step_dialog(self):
+        region = [0.1, 0.2, 0.5, 0.6]
+        closed = []
+        fake = SimpleNamespace(
+            _step_dialog={
+                'action': "wait_for_template",
+                'comment_var': _Var(""),
+                'param_fields': {"region": _Var(str(region))},
+                'optional_var': _Var(False),
+                'step_delay_var': _Var(""),
+            },
+            _close_step_dialog=closed.append,
+        )
+        with mock.patch.object(workflow_builder.messagebox, "showerror") as showerror:
+            WorkflowBuilder._on_step_dialog_ok(fake)
+        showerror.assert_not_called()
+        self.assertEqual(closed[0]["region"], region)
+        self.assertEqual(yaml.safe_load(yaml.safe_dump(closed[0]))["region"], region)
+
+    def test_region_round_trips_through_cell_edit(self):
+        region = [0.1, 0.2, 0.5, 0.6]
+        step = {"action": "wait_for_template", "region": [0.0, 0.0, 1.0, 1.0]}
+        fake = SimpleNamespace(workflow_steps=[step], _params_text={},
+                               _render_step=lambda index: None)
+        with mock.patch.object(workflow_builder.messagebox, "showerror") as showerror:
+            WorkflowBuilder._commit_cell_edit(fake, 0, "region", str(region))
+        showerror.assert_not_called()
+        self.assertEqual(fake.workflow_steps[0]["region"], region)
+        self.assertEqual(yaml.safe_load(yaml.safe_dump(fake.workflow_steps[0]))["region"], region)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,10 +1,363 @@
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
 import yaml
+import json
 import os
+import sys
+import subprocess
+import logging
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from datetime import datetime
 
+# Use the libyaml-backed loader/dumper when available
+_SafeLoader = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+_SafeDumper = getattr(yaml, 'CSafeDumper', yaml.SafeDumper)
+if _SafeLoader is yaml.SafeLoader:
+    logging.getLogger(__name__).warning(
+        "PyYAML has no libyaml support; workflow files will load with the slower "
+        "pure-Python parser (reinstall PyYAML with libyaml to speed this up)")
+
+# Optional: only needed for template previews, which report it when missing
+try:
+    from PIL import Image, ImageTk
+except ImportError:
+    Image = None
+    ImageTk = None
+
+# Parameter kinds, built once; the step dialog checks every parameter against these
+_INT_PARAMS = frozenset({"timeout", "duration", "seconds", "x", "y", "max_retries", "retry_delay", "startup_time"})
+_FLOAT_PARAMS = frozenset({"threshold", "move_duration", "pre_click_delay", "post_click_delay"})
+_LIST_PARAMS = frozenset({"region", "offset"})
+# Number of values each list parameter holds, and their type: region is a
+# normalized 0-1 box, offset is in pixels
+_LIST_PARAM_LENGTHS = {"region": 4, "offset": 2}
+_LIST_PARAM_TYPES = {"region": float, "offset": int}
+# Format hints shown next to a parameter's entry
+_PARAM_HINTS = {"templates": "(comma-separated)", "region": "[x1,y1,x2,y2]", "offset": "[x,y]"}
+# Parameters the inline cell editor leaves to the step dialog (template pickers,
+# regions, and non-text widgets)
+_DIALOG_ONLY_PARAMS = frozenset({"template", "templates", "region", "button", "force", "optional"})
+# Step keys not listed under Parameters: those with their own tree column
+_ROW_SKIP_KEYS = frozenset({"action", "comment", "step_number"})
+# Order in which step parameters are written to YAML; unlisted ones follow
+_YAML_PARAM_ORDER = ("template", "templates", "timeout", "threshold", "region", "button", "offset",
+                     "move_duration", "pre_click_delay", "post_click_delay", "key", "duration",
+                     "text", "x", "y", "seconds", "name", "message", "force", "process_name",
+                     "action_to_retry", "max_retries", "retry_delay", "optional", "step_delay")
+# Keys already written by the ordered pass or as the step header
+_YAML_ORDERED_KEYS = frozenset(_YAML_PARAM_ORDER) | _ROW_SKIP_KEYS
+
+# Available actions with their parameters
+ACTION_DEFINITIONS = {
+    "launch_game": {
+        "description": "🚀 Launch the configured game",
+        "parameters": []
+    },
+    "wait_for_game": {
+        "description": "⏳ Wait for game process to start",
+        "parameters": ["timeout", "process_name"]
+    },
+    "exit_game": {
+        "description": "🛑 Close the game process",
+        "parameters": ["force", "process_name"]
+    },
+    "wait_for_template": {
+        "description": "🎯 Wait for UI template to appear",
+        "parameters": ["template", "timeout", "region", "threshold"]
+    },
+    "wait_for_any_template": {
+        "description": "🎯 Wait for any of multiple templates",
+        "parameters": ["templates", "timeout", "region", "threshold"]
+    },
+    "wait_for_template_disappear": {
+        "description": "👻 Wait for template to disappear",
+        "parameters": ["template", "timeout", "region", "threshold"]
+    },
+    "click_template": {
+        "description": "🖱️ Find and click on template",
+        "parameters": ["template", "timeout", "region", "threshold", "button", "offset", "move_duration", "pre_click_delay", "post_click_delay"]
+    },
+    "click_template_if_exists": {
+        "description": "🖱️ Click template if it exists (optional)",
+        "parameters": ["template", "region", "threshold", "button", "delay", "offset"]
+    },
+    "check_template": {
+        "description": "🔍 Check if template exists",
+        "parameters": ["template", "region", "threshold"]
+    },
+    "press_key": {
+        "description": "⌨️ Press and release a key",
+        "parameters": ["key", "delay"]
+    },
+    "hold_key": {
+        "description": "⌨️ Hold a key for duration",
+        "parameters": ["key", "duration"]
+    },
+    "type_text": {
+        "description": "📝 Type text string",
+        "parameters": ["text", "delay"]
+    },
+    "click": {
+        "description": "🖱️ Click at coordinates",
+        "parameters": ["x", "y", "button", "delay"]
+    },
+    "take_screenshot": {
+        "description": "📸 Capture screenshot",
+        "parameters": ["name", "region"]
+    },
+    "wait_for_screen_change": {
+        "description": "🔄 Wait for screen to change",
+        "parameters": ["timeout", "region", "threshold"]
+    },
+    "wait": {
+        "description": "⏰ Wait for specified time",
+        "parameters": ["seconds"]
+    },
+    "log_message": {
+        "description": "📝 Log timestamped message",
+        "parameters": ["message"]
+    },
+    "retry_action": {
+        "description": "🔄 Retry a sub-action",
+        "parameters": ["action_to_retry", "max_retries", "retry_delay"]
+    }
+}
+# Action names in definition order, for the action combobox
+_ACTION_NAMES = tuple(ACTION_DEFINITIONS)
+
+# Game config fields: (label, key, kind[, combobox values])
+_CONFIG_FIELDS = (
+    ("Game Name:", "name", "text"),
+    ("Type:", "type", "combo", ["steam", "epic", "other"]),
+    ("Steam App ID:", "app_id", "text"),
+    ("Executable Name:", "exe_name", "text"),
+    ("Process Name:", "process_name", "text"),
+    ("Launch Options:", "launch_options", "text"),
+    ("Startup Time (s):", "startup_time", "number")
+)
+
+# Font of the template listbox
+_LISTBOX_FONT = ('Segoe UI', 8)
+
+# Position of each ordered parameter, for sorting a step's keys
+_YAML_PARAM_RANK = {param: i for i, param in enumerate(_YAML_PARAM_ORDER)}
+# yaml.dump options for workflow files; no line wrapping of long strings
+_YAML_DUMP_OPTIONS = dict(default_flow_style=False, sort_keys=False, allow_unicode=True, width=2**31 - 1)
+
+
+class _WorkflowDumper(_SafeDumper):
+    """Dumper for workflow files: no anchors, and scalar lists such as regions in flow style
+    
+    Duplicated steps share their list values, which would otherwise come out
+    as &id001 references.
+    """
+    
+    def ignore_aliases(self, data):
+        return True
+
+
+def _represent_list(dumper, data):
+    flow = not any(isinstance(value, (list, tuple, dict)) for value in data)
+    return dumper.represent_sequence('tag:yaml.org,2002:seq', data, flow_style=flow)
+
+
+_WorkflowDumper.add_representer(list, _represent_list)
+_WorkflowDumper.add_representer(tuple, _represent_list)
+
+
+def _ordered_step(step):
+    """Copy of step with keys in file order: action, _YAML_PARAM_ORDER, then the rest"""
+    ordered = {"action": step["action"]}
+    rank = _YAML_PARAM_RANK
+    for key in sorted((key for key in step if key in rank), key=rank.__getitem__):
+        ordered[key] = step[key]
+    for key, value in step.items():
+        if key not in _YAML_ORDERED_KEYS:
+            ordered[key] = value
+    return ordered
+
+
+def _render_workflow_yaml(config, steps):
+    """Lay out a workflow file's YAML text; pure, so it can run on the I/O pool
+    
+    The config and the step list are each serialised by one yaml.dump call;
+    the step list is then indented under "workflow:" with each step's
+    comment and "#N" marker lines put in front of it.
+    """
+    parts = [yaml.dump(config, Dumper=_WorkflowDumper, **_YAML_DUMP_OPTIONS)]
+    if not steps:
+        # Nothing to lay out; an explicit empty list also loads back as a list
+        parts.append("\nworkflow: []\n")
+        return ''.join(parts)
+    
+    parts.append("\nworkflow:\n")
+    append = parts.append
+    body = yaml.dump([_ordered_step(step) for step in steps], Dumper=_WorkflowDumper,
+                     **_YAML_DUMP_OPTIONS)
+    
+    # Every step starts at a "- " line in column 0; nested content is indented
+    i = -1
+    for line in body.splitlines(True):
+        if line.startswith("- "):
+            i += 1
+            step = steps[i]
+            if i:
+                append("\n")  # Empty line between steps
+            comment = step.get('comment', '').strip()
+            if comment:
+                append(f"  # {comment}\n")
+            append(f"  #{step.get('step_number', i + 1)}\n")
+        append("  " + line)
+    
+    return ''.join(parts)
+
+
+# Tags of a Treeview row holding an optional step
+_OPTIONAL_ROW_TAGS = ("optional",)
+
+# Template images live in <root>/<game>/<name>.png
+_TEMPLATES_ROOT = os.path.join("templates", "screens")
+
+# Characters inserted into the YAML preview per idle callback
+_PREVIEW_TEXT_CHUNK = 65536
+
+# Bounding box for template previews; the preview window has a fixed size
+_PREVIEW_MAX_SIZE = (550, 400)
+
+# Parsed workflow files: abs path -> ((mtime_ns, size), data), LRU order
+_yaml_cache = OrderedDict()
+_yaml_cache_lock = threading.Lock()
+_YAML_CACHE_SIZE = 32
+# Upper bound on how much of config/games the builder pre-parses at startup
+_PREWARM_MAX_BYTES = 16 * 1024 * 1024
+
+
+def _parse_list_param(param, text):
+    """Parse a region/offset value such as "[0.1, 0.2, 0.5, 0.6]" or "[10, -5]"
+    
+    Region parts are parsed as floats and offset parts as ints. Raises
+    ValueError when the text is not a bracketed or bare list of numbers of
+    the length the parameter expects.
+    """
+    convert = _LIST_PARAM_TYPES[param]
+    values = [convert(part) for part in text.strip().strip("[]()").replace(",", " ").split()]
+    if len(values) != _LIST_PARAM_LENGTHS[param]:
+        raise ValueError(f"expected {_LIST_PARAM_LENGTHS[param]} values")
+    return values
+
+
+def _read_bytes(path):
+    """Read a workflow file in one call (runs on the I/O pool)"""
+    return Path(path).read_bytes()
+
+
+def _popen_opener(opener):
+    """Return a function that opens a folder with opener without waiting for it"""
+    def open_folder(path):
+        subprocess.Popen([opener, path], close_fds=True, stdin=subprocess.DEVNULL,
+                         stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    return open_folder
+
+
+# Open a folder in the platform's file browser; picked once at import
+if sys.platform == "win32":
+    _open_folder = os.startfile
+elif sys.platform == "darwin":
+    _open_folder = _popen_opener("open")
+else:
+    _open_folder = _popen_opener("xdg-open")
+
+
+def _row_tags(step):
+    """Treeview tags for a step's row; optional steps are drawn greyed out"""
+    return _OPTIONAL_ROW_TAGS if step.get("optional") else ()
+
+
+def _load_yaml_cached(path):
+    """Parse a workflow file, reusing the last result while its mtime and size are unchanged
+    
+    Runs on the I/O pool. The returned object is shared with the cache; callers
+    must not modify it.
+    """
+    path = os.path.abspath(path)
+    st = os.stat(path)
+    key = (st.st_mtime_ns, st.st_size)
+    with _yaml_cache_lock:
+        entry = _yaml_cache.get(path)
+        if entry is not None and entry[0] == key:
+            _yaml_cache.move_to_end(path)
+            return entry[1]
+    
+    # The loader decodes the raw bytes itself (UTF-8/UTF-16 by BOM)
+    data = yaml.load(_read_bytes(path), Loader=_SafeLoader)
+    with _yaml_cache_lock:
+        _yaml_cache[path] = (key, data)
+        _yaml_cache.move_to_end(path)
+        if len(_yaml_cache) > _YAML_CACHE_SIZE:
+            _yaml_cache.popitem(last=False)
+    return data
+
+
+def _prewarm_yaml_cache(directory="config/games"):
+    """Parse the workflow files in directory into the in-memory cache (runs on the I/O pool)
+    
+    Opening one of them later is then a cache hit instead of a cold read and parse.
+    Only reads: opening the builder must never create or modify files. Stops once
+    _PREWARM_MAX_BYTES have been read or the cache is full.
+    """
+    budget = _PREWARM_MAX_BYTES
+    try:
+        with os.scandir(directory) as entries:
+            paths = [(entry.path, entry.stat().st_size) for entry in entries
+                     if entry.name.endswith(".yaml") and entry.is_file()]
+    except OSError:
+        return
+    for path, size in paths[:_YAML_CACHE_SIZE]:
+        if size > budget:
+            break
+        budget -= size
+        try:
+            _load_yaml_cached(path)
+        except Exception:
+            # Broken files are reported when the user actually opens them
+            pass
+
+
+def _write_bytes(path, data, unchanged_mtime=None):
+    """Write a workflow file with a single write() call (runs on the I/O pool)
+    
+    The data goes to a temporary file next to the target which then replaces it,
+    so a failed save never leaves a truncated workflow behind. When the caller
+    knows the file already holds data as of unchanged_mtime and the file still
+    has that mtime, the write is skipped. Returns the file's mtime afterwards.
+    """
+    if unchanged_mtime is not None:
+        try:
+            if os.stat(path).st_mtime_ns == unchanged_mtime:
+                return unchanged_mtime
+        except FileNotFoundError:
+            pass
+    
+    tmp_path = f"{path}.tmp"
+    try:
+        # Deliberately no os.fsync: these are user-edited config files, not a
+        # journal, and close() + replace() is all the durability a save needs
+        Path(tmp_path).write_bytes(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+    with _yaml_cache_lock:
+        _yaml_cache.pop(os.path.abspath(path), None)
+    return os.stat(path).st_mtime_ns
+
+
 class WorkflowBuilder:
     def __init__(self, parent=None, game_name=None, existing_workflow=None):
         self.root = tk.Toplevel(parent) if parent else tk.Tk()
@@ -26,81 +379,33 @@ class WorkflowBuilder:
         self.workflow_steps = existing_workflow or []
         self.step_counter = len(self.workflow_steps)
         
-        # Available actions with their parameters
-        self.action_definitions = {
-            "launch_game": {
-                "description": "🚀 Launch the configured game",
-                "parameters": []
-            },
-            "wait_for_game": {
-                "description": "⏳ Wait for game process to start",
-                "parameters": ["timeout", "process_name"]
-            },
-            "exit_game": {
-                "description": "🛑 Close the game process",
-                "parameters": ["force", "process_name"]
-            },
-            "wait_for_template": {
-                "description": "🎯 Wait for UI template to appear",
-                "parameters": ["template", "timeout", "region", "threshold"]
-            },
-            "wait_for_any_template": {
-                "description": "🎯 Wait for any of multiple templates",
-                "parameters": ["templates", "timeout", "region", "threshold"]
-            },
-            "wait_for_template_disappear": {
-                "description": "👻 Wait for template to disappear",
-                "parameters": ["template", "timeout", "region", "threshold"]
-            },
-            "click_template": {
-                "description": "🖱️ Find and click on template",
-                "parameters": ["template", "timeout", "region", "threshold", "button", "offset", "move_duration", "pre_click_delay", "post_click_delay"]
-            },
-            "click_template_if_exists": {
-                "description": "🖱️ Click template if it exists (optional)",
-                "parameters": ["template", "region", "threshold", "button", "delay", "offset"]
-            },
-            "check_template": {
-                "description": "🔍 Check if template exists",
-                "parameters": ["template", "region", "threshold"]
-            },
-            "press_key": {
-                "description": "⌨️ Press and release a key",
-                "parameters": ["key", "delay"]
-            },
-            "hold_key": {
-                "description": "⌨️ Hold a key for duration",
-                "parameters": ["key", "duration"]
-            },
-            "type_text": {
-                "description": "📝 Type text string",
-                "parameters": ["text", "delay"]
-            },
-            "click": {
-                "description": "🖱️ Click at coordinates",
-                "parameters": ["x", "y", "button", "delay"]
-            },
-            "take_screenshot": {
-                "description": "📸 Capture screenshot",
-                "parameters": ["name", "region"]
-            },
-            "wait_for_screen_change": {
-                "description": "🔄 Wait for screen to change",
-                "parameters": ["timeout", "region", "threshold"]
-            },
-            "wait": {
-                "description": "⏰ Wait for specified time",
-                "parameters": ["seconds"]
-            },
-            "log_message": {
-                "description": "📝 Log timestamped message",
-                "parameters": ["message"]
-            },
-            "retry_action": {
-                "description": "🔄 Retry a sub-action",
-                "parameters": ["action_to_retry", "max_retries", "retry_delay"]
-            }
-        }
+        # Available actions with their parameters (shared, never modified)
+        self.action_definitions = ACTION_DEFINITIONS
+        
+        # Template listing cache, reused while the directory mtimes are unchanged
+        self._templates_cache = None
+        self._templates_cache_mtimes = {}
+        # Listbox entry ("game/name.png") -> file path, rebuilt with the cache
+        self._template_index = {}
+        # Sorted, de-duplicated template file names for the step dialog's combobox
+        self._flat_templates = ()
+        # Listing currently shown in the template listbox, so unchanged refreshes are skipped
+        self._listed_templates = None
+        # (template, max size, file mtime) -> (PhotoImage, original size), LRU order
+        self._preview_cache = OrderedDict()
+        # Workflow file reads/writes run here so slow or network drives don't block Tk
+        self._io_pool = ThreadPoolExecutor(max_workers=2)
+        # (abs path, bytes, mtime_ns) of the last successful save
+        self._last_saved = None
+        # (config values, steps, step numbers) -> text of the last generate_yaml
+        self._yaml_render = None
+        # id(step) -> (step, Parameters column text); see _step_values
+        self._params_text = {}
+        # Step dialog and template preview widgets, built on first use and reused afterwards
+        self._preview_window = None
+        self._step_dialog = None
+        # Read-only warm-up of the in-memory workflow cache
+        self._io_pool.submit(_prewarm_yaml_cache)
         
         self.setup_ui()
         
@@ -109,6 +414,18 @@ class WorkflowBuilder:
     
     def setup_ui(self):
         """Set up the main UI"""
+        # Status bar for non-modal notices (packed first so it keeps the bottom edge)
+        status_frame = ttk.Frame(self.root)
+        status_frame.pack(side=tk.BOTTOM, fill=tk.X, padx=10, pady=(0, 5))
+        self.status_var = tk.StringVar()
+        self._status_clear_id = None
+        ttk.Label(status_frame, textvariable=self.status_var, foreground="gray",
+                  anchor="w").pack(side=tk.LEFT, fill=tk.X, expand=True)
+        
+        # Indeterminate bar shown only while file I/O is in flight
+        self._io_progress = ttk.Progressbar(status_frame, mode="indeterminate", length=120)
+        self._io_pending = 0
+        
         # Create main container
         main_container = ttk.PanedWindow(self.root, orient=tk.HORIZONTAL)
         main_container.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
@@ -123,6 +440,10 @@ class WorkflowBuilder:
         
         self.setup_left_panel(left_panel)
         self.setup_right_panel(right_panel)
+        
+        # Fill the step list and template list once the window has been drawn
+        self.root.after_idle(self.refresh_tree)
+        self.root.after_idle(self.refresh_templates)
     
     def setup_left_panel(self, parent):
         """Set up the left panel with game config and controls"""
@@ -130,19 +451,11 @@ class WorkflowBuilder:
         game_frame = ttk.LabelFrame(parent, text="🎮 Game Configuration", padding=10)
         game_frame.pack(fill=tk.X, pady=(0, 10))
         
-        # Game config fields
-        config_fields = [
-            ("Game Name:", "name", "text"),
-            ("Type:", "type", "combo", ["steam", "epic", "other"]),
-            ("Steam App ID:", "app_id", "text"),
-            ("Executable Name:", "exe_name", "text"),
-            ("Process Name:", "process_name", "text"),
-            ("Launch Options:", "launch_options", "text"),
-            ("Startup Time (s):", "startup_time", "number")
-        ]
-        
+        # The variables are kept for setting fields on load/new; values are read
+        # straight from the widgets (see _read_game_config)
         self.config_vars = {}
-        for i, field_info in enumerate(config_fields):
+        self.config_entries = {}
+        for i, field_info in enumerate(_CONFIG_FIELDS):
             label_text, key, field_type = field_info[:3]
             
             ttk.Label(game_frame, text=label_text).grid(row=i, column=0, sticky="w", pady=2)
@@ -153,14 +466,15 @@ class WorkflowBuilder:
                 entry.grid(row=i, column=1, sticky="ew", pady=2, padx=(5, 0))
             elif field_type == "combo":
                 var = tk.StringVar(value=self.game_config.get(key, field_info[3][0]))
-                combo = ttk.Combobox(game_frame, textvariable=var, values=field_info[3], width=27, state="readonly")
-                combo.grid(row=i, column=1, sticky="ew", pady=2, padx=(5, 0))
+                entry = ttk.Combobox(game_frame, textvariable=var, values=field_info[3], width=27, state="readonly")
+                entry.grid(row=i, column=1, sticky="ew", pady=2, padx=(5, 0))
             elif field_type == "number":
                 var = tk.IntVar(value=self.game_config.get(key, 60))
                 entry = ttk.Entry(game_frame, textvariable=var, width=30)
                 entry.grid(row=i, column=1, sticky="ew", pady=2, padx=(5, 0))
             
             self.config_vars[key] = var
+            self.config_entries[key] = entry
         
         game_frame.grid_columnconfigure(1, weight=1)
         
@@ -171,7 +485,7 @@ class WorkflowBuilder:
         ttk.Label(action_frame, text="Action Type:").pack(anchor="w")
         self.action_var = tk.StringVar()
         self.action_combo = ttk.Combobox(action_frame, textvariable=self.action_var, 
-                                        values=list(self.action_definitions.keys()), 
+                                        values=_ACTION_NAMES, 
                                         state="readonly", width=40)
         self.action_combo.pack(fill=tk.X, pady=(2, 5))
         self.action_combo.bind('<<ComboboxSelected>>', self.on_action_selected)
@@ -180,6 +494,7 @@ class WorkflowBuilder:
         self.action_desc = ttk.Label(action_frame, text="Select an action to see description", 
                                     foreground="gray", wraplength=300)
         self.action_desc.pack(anchor="w", pady=(0, 10))
+        self._shown_action = None
         
         # Comment field
         ttk.Label(action_frame, text="Comment (optional):").pack(anchor="w")
@@ -192,7 +507,7 @@ class WorkflowBuilder:
         template_frame.pack(fill=tk.X, pady=(5, 10))
         
         ttk.Label(template_frame, text="Available Templates:").pack(anchor="w")
-        self.template_listbox = tk.Listbox(template_frame, height=4, font=('Segoe UI', 8))
+        self.template_listbox = tk.Listbox(template_frame, height=4, font=_LISTBOX_FONT)
         self.template_listbox.pack(fill=tk.X, pady=(2, 5))
         self.template_listbox.bind('<Double-Button-1>', self.on_template_double_click)
         
@@ -201,16 +516,12 @@ class WorkflowBuilder:
         ttk.Button(template_btn_frame, text="🔄 Refresh", command=self.refresh_templates).pack(side=tk.LEFT, padx=(0, 5))
         ttk.Button(template_btn_frame, text="📁 Browse", command=self.browse_templates).pack(side=tk.LEFT)
         
-        self.refresh_templates()
-        
         # Add step button
         add_button = ttk.Button(action_frame, text="➕ Add Step", command=self.add_step)
         add_button.pack(pady=5)
         
-        # File Operations Section
-        file_frame = ttk.LabelFrame(parent, text="💾 File Operations", padding=10)
-        file_frame.pack(fill=tk.X, pady=(0, 10))
-        
+        # File and step operations are drop-down menus: menu entries are plain
+        # Tcl strings, not a ttk.Button widget each
         file_buttons = [
             ("📂 Load Workflow", self.load_workflow),
             ("💾 Save Workflow", self.save_workflow),
@@ -218,13 +529,6 @@ class WorkflowBuilder:
             ("👀 Preview YAML", self.preview_yaml)
         ]
         
-        for text, command in file_buttons:
-            ttk.Button(file_frame, text=text, command=command).pack(fill=tk.X, pady=2)
-        
-        # Step Operations Section
-        step_frame = ttk.LabelFrame(parent, text="🔧 Step Operations", padding=10)
-        step_frame.pack(fill=tk.BOTH, expand=True)
-        
         step_buttons = [
             ("⬆️ Move Up", self.move_step_up),
             ("⬇️ Move Down", self.move_step_down),
@@ -234,8 +538,16 @@ class WorkflowBuilder:
             ("🔢 Renumber Steps", self.renumber_steps)
         ]
         
-        for text, command in step_buttons:
-            ttk.Button(step_frame, text=text, command=command).pack(fill=tk.X, pady=2)
+        ops_frame = ttk.Frame(parent)
+        ops_frame.pack(fill=tk.X, pady=(0, 10))
+        
+        for title, commands in (("💾 File Operations", file_buttons), ("🔧 Step Operations", step_buttons)):
+            menu_button = ttk.Menubutton(ops_frame, text=title)
+            menu = tk.Menu(menu_button, tearoff=0)
+            for text, command in commands:
+                menu.add_command(label=text, command=command)
+            menu_button["menu"] = menu
+            menu_button.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=(0, 5))
     
     def setup_right_panel(self, parent):
         """Set up the right panel with workflow steps"""
@@ -258,6 +570,9 @@ class WorkflowBuilder:
         self.tree.column("Parameters", width=300)
         self.tree.column("Comment", width=200)
         
+        # Row styles are set once per tag; rows only name their tag
+        self.tree.tag_configure("optional", foreground="#888888")
+        
         # Add scrollbars
         v_scrollbar = ttk.Scrollbar(workflow_frame, orient="vertical", command=self.tree.yview)
         h_scrollbar = ttk.Scrollbar(workflow_frame, orient="horizontal", command=self.tree.xview)
@@ -271,17 +586,20 @@ class WorkflowBuilder:
         workflow_frame.grid_rowconfigure(0, weight=1)
         workflow_frame.grid_columnconfigure(0, weight=1)
         
-        # Bind double-click to edit
-        self.tree.bind("<Double-1>", lambda e: self.edit_step())
-        
-        self.refresh_tree()
+        # Bind double-click to edit (in place where a single value is clicked)
+        self._cell_editor = None
+        self.tree.bind("<Double-1>", self.on_tree_double_click)
     
     def on_action_selected(self, event=None):
         """Update description when action is selected"""
         action = self.action_var.get()
+        if action == self._shown_action:
+            # Re-selecting the same action; the label already shows it
+            return
         if action in self.action_definitions:
             desc = self.action_definitions[action]["description"]
             self.action_desc.config(text=desc, foreground="black")
+            self._shown_action = action
     
     def add_step(self):
         """Add a new step to the workflow"""
@@ -301,36 +619,112 @@ class WorkflowBuilder:
                 step_data['comment'] = comment
             
             self.workflow_steps.append(step_data)
-            self.refresh_tree()
+            index = len(self.workflow_steps) - 1
+            self.tree.insert("", "end", values=self._step_values(index, step_data),
+                             tags=_row_tags(step_data))
             
             # Clear comment field
             self.comment_var.set("")
     
     def create_step_dialog(self, action, comment="", existing_step=None):
-        """Create a dialog for step parameters"""
-        dialog = tk.Toplevel(self.root)
+        """Show the step dialog for action and return the entered step, or None if cancelled
+        
+        The dialog window is built once and reused; each call only rebuilds the
+        parameter rows for the chosen action.
+        """
+        d = self._step_dialog or self._build_step_dialog()
+        dialog = d['dialog']
         dialog.title(f"Configure Step: {action}")
-        dialog.geometry("500x600")
-        dialog.transient(self.root)
-        dialog.grab_set()
+        d['title'].config(text=f"Configure: {action}")
+        d['desc'].config(text=self.action_definitions[action]["description"])
+        d['comment_var'].set(comment)
+        
+        # Parameters
+        scrollable_frame = d['params_frame']
+        for child in scrollable_frame.winfo_children():
+            child.destroy()
+        
+        param_fields = {}
+        parameters = self.action_definitions[action]["parameters"]
+        all_templates = self._flat_templates
+        
+        # One grid in the scrollable frame instead of a Frame per row; the
+        # columns are label, input and an optional format hint
+        for row, param in enumerate(parameters):
+            ttk.Label(scrollable_frame, text=f"{param}:", width=20).grid(row=row, column=0, sticky="w", pady=5)
+            
+            # Get existing value if editing
+            existing_value = ""
+            if existing_step and param in existing_step:
+                existing_value = existing_step[param]
+            
+            # Create appropriate widget based on parameter; text inputs are read
+            # with widget.get(), so only the checkbox needs a Tk variable
+            if param == "button":
+                # Button type dropdown
+                widget = field = ttk.Combobox(scrollable_frame, values=["left", "right", "middle"],
+                                              state="readonly", width=37)
+                field.set(existing_value or "left")
+            elif param == "force":
+                # Boolean checkbox
+                field = tk.BooleanVar(value=existing_value or False)
+                widget = ttk.Checkbutton(scrollable_frame, variable=field)
+            else:
+                if param == "template":
+                    # Single template - editable dropdown of known template files
+                    widget = field = ttk.Combobox(scrollable_frame, values=all_templates, width=37)
+                else:
+                    # Text, numeric, float and list fields share a plain entry
+                    widget = field = ttk.Entry(scrollable_frame, width=40)
+                if existing_value:
+                    field.insert(0, str(existing_value))
+            
+            widget.grid(row=row, column=1, sticky="w" if param == "force" else "ew", pady=5)
+            hint = _PARAM_HINTS.get(param)
+            if hint:
+                ttk.Label(scrollable_frame, text=hint, foreground="gray").grid(row=row, column=2, sticky="e")
+            
+            param_fields[param] = field
+        
+        # Global parameters
+        d['optional_var'].set(existing_step.get('optional', False) if existing_step else False)
+        d['step_delay_var'].set(str(existing_step.get('step_delay', '')) if existing_step else "")
+        
+        d['action'] = action
+        d['param_fields'] = param_fields
+        d['result'] = None
         
         # Center dialog
         dialog.geometry("+%d+%d" % (self.root.winfo_rootx() + 100, self.root.winfo_rooty() + 100))
+        d['canvas'].yview_moveto(0)
+        dialog.deiconify()
+        dialog.grab_set()
+        
+        # Wait for OK/Cancel to hide the dialog again
+        dialog.wait_variable(d['done'])
+        return d['result']
+    
+    def _build_step_dialog(self):
+        """Create the hidden, reusable step dialog (everything except the parameter rows)"""
+        dialog = tk.Toplevel(self.root)
+        dialog.withdraw()
+        dialog.geometry("500x600")
+        dialog.transient(self.root)
         
         main_frame = ttk.Frame(dialog, padding=20)
         main_frame.pack(fill=tk.BOTH, expand=True)
         
         # Title
-        ttk.Label(main_frame, text=f"Configure: {action}", 
-                 font=("Arial", 12, "bold")).pack(pady=(0, 10))
+        title_label = ttk.Label(main_frame, font=("Arial", 12, "bold"))
+        title_label.pack(pady=(0, 10))
         
         # Description
-        desc = self.action_definitions[action]["description"]
-        ttk.Label(main_frame, text=desc, foreground="gray").pack(pady=(0, 15))
+        desc_label = ttk.Label(main_frame, foreground="gray")
+        desc_label.pack(pady=(0, 15))
         
         # Comment field
         ttk.Label(main_frame, text="Comment:").pack(anchor="w")
-        comment_var = tk.StringVar(value=comment)
+        comment_var = tk.StringVar()
         comment_entry = ttk.Entry(main_frame, textvariable=comment_var, width=60)
         comment_entry.pack(fill=tk.X, pady=(2, 15))
         
@@ -338,72 +732,25 @@ class WorkflowBuilder:
         canvas = tk.Canvas(main_frame)
         scrollbar = ttk.Scrollbar(main_frame, orient="vertical", command=canvas.yview)
         scrollable_frame = ttk.Frame(canvas)
+        scrollable_frame.grid_columnconfigure(1, weight=1)
         
-        scrollable_frame.bind(
-            "<Configure>",
-            lambda e: canvas.configure(scrollregion=canvas.bbox("all"))
-        )
+        # Packing each parameter row fires <Configure>; recompute the scroll
+        # region once per burst instead of once per event
+        scroll_update = [None]
         
-        canvas.create_window((0, 0), window=scrollable_frame, anchor="nw")
-        canvas.configure(yscrollcommand=scrollbar.set)
+        def update_scrollregion():
+            scroll_update[0] = None
+            canvas.configure(scrollregion=canvas.bbox("all"))
         
-        # Parameters
-        param_vars = {}
-        parameters = self.action_definitions[action]["parameters"]
+        def on_frame_configure(event):
+            if scroll_update[0] is not None:
+                canvas.after_cancel(scroll_update[0])
+            scroll_update[0] = canvas.after(120, update_scrollregion)
         
-        for param in parameters:
-            param_frame = ttk.Frame(scrollable_frame)
-            param_frame.pack(fill=tk.X, pady=5)
-            
-            ttk.Label(param_frame, text=f"{param}:", width=20).pack(side=tk.LEFT)
-            
-            # Get existing value if editing
-            existing_value = ""
-            if existing_step and param in existing_step:
-                existing_value = existing_step[param]
-            
-            # Create appropriate widget based on parameter
-            if param in ["templates"]:
-                # Multiple templates - text area
-                var = tk.StringVar(value=str(existing_value) if existing_value else "")
-                entry = ttk.Entry(param_frame, textvariable=var, width=40)
-                entry.pack(side=tk.LEFT, fill=tk.X, expand=True)
-                ttk.Label(param_frame, text="(comma-separated)", foreground="gray").pack(side=tk.RIGHT)
-            elif param in ["timeout", "duration", "seconds", "x", "y", "max_retries", "retry_delay"]:
-                # Numeric fields
-                var = tk.StringVar(value=str(existing_value) if existing_value else "")
-                entry = ttk.Entry(param_frame, textvariable=var, width=40)
-                entry.pack(side=tk.LEFT, fill=tk.X, expand=True)
-            elif param in ["threshold", "move_duration", "pre_click_delay", "post_click_delay"]:
-                # Float fields
-                var = tk.StringVar(value=str(existing_value) if existing_value else "")
-                entry = ttk.Entry(param_frame, textvariable=var, width=40)
-                entry.pack(side=tk.LEFT, fill=tk.X, expand=True)
-            elif param == "button":
-                # Button type dropdown
-                var = tk.StringVar(value=existing_value or "left")
-                combo = ttk.Combobox(param_frame, textvariable=var, 
-                                   values=["left", "right", "middle"], state="readonly", width=37)
-                combo.pack(side=tk.LEFT, fill=tk.X, expand=True)
-            elif param == "force":
-                # Boolean checkbox
-                var = tk.BooleanVar(value=existing_value or False)
-                check = ttk.Checkbutton(param_frame, variable=var)
-                check.pack(side=tk.LEFT)
-            elif param in ["region", "offset"]:
-                # List/tuple fields
-                var = tk.StringVar(value=str(existing_value) if existing_value else "")
-                entry = ttk.Entry(param_frame, textvariable=var, width=40)
-                entry.pack(side=tk.LEFT, fill=tk.X, expand=True)
-                ttk.Label(param_frame, text="[x1,y1,x2,y2]" if param == "region" else "[x,y]", 
-                         foreground="gray").pack(side=tk.RIGHT)
-            else:
-                # Default text field
-                var = tk.StringVar(value=str(existing_value) if existing_value else "")
-                entry = ttk.Entry(param_frame, textvariable=var, width=40)
-                entry.pack(side=tk.LEFT, fill=tk.X, expand=True)
-            
-            param_vars[param] = var
+        scrollable_frame.bind("<Configure>", on_frame_configure)
+        
+        canvas.create_window((0, 0), window=scrollable_frame, anchor="nw")
+        canvas.configure(yscrollcommand=scrollbar.set)
         
         canvas.pack(side="left", fill="both", expand=True)
         scrollbar.pack(side="right", fill="y")
@@ -412,11 +759,11 @@ class WorkflowBuilder:
         global_frame = ttk.LabelFrame(main_frame, text="Global Parameters")
         global_frame.pack(fill=tk.X, pady=(15, 10))
         
-        optional_var = tk.BooleanVar(value=existing_step.get('optional', False) if existing_step else False)
+        optional_var = tk.BooleanVar(value=False)
         ttk.Checkbutton(global_frame, text="Optional (don't stop workflow on failure)", 
                        variable=optional_var).pack(anchor="w", padx=5, pady=2)
         
-        step_delay_var = tk.StringVar(value=str(existing_step.get('step_delay', '')) if existing_step else "")
+        step_delay_var = tk.StringVar()
         delay_frame = ttk.Frame(global_frame)
         delay_frame.pack(fill=tk.X, padx=5, pady=2)
         ttk.Label(delay_frame, text="Step delay (seconds):").pack(side=tk.LEFT)
@@ -426,92 +773,128 @@ class WorkflowBuilder:
         button_frame = ttk.Frame(main_frame)
         button_frame.pack(fill=tk.X, pady=(10, 0))
         
-        result = [None]
-        
-        def on_ok():
-            step_data = {"action": action}
-            
-            # Add comment if provided
-            comment_text = comment_var.get().strip()
-            if comment_text:
-                step_data["comment"] = comment_text
-            
-            # Add parameters
-            for param, var in param_vars.items():
-                value = var.get()
-                if value:  # Only add non-empty values
-                    # Convert values to appropriate types
-                    if param in ["timeout", "duration", "seconds", "x", "y", "max_retries", "retry_delay", "startup_time"]:
-                        try:
-                            step_data[param] = int(value)
-                        except ValueError:
-                            messagebox.showerror("Error", f"Invalid number for {param}: {value}")
-                            return
-                    elif param in ["threshold", "move_duration", "pre_click_delay", "post_click_delay"]:
-                        try:
-                            step_data[param] = float(value)
-                        except ValueError:
-                            messagebox.showerror("Error", f"Invalid decimal for {param}: {value}")
-                            return
-                    elif param in ["region", "offset"]:
-                        try:
-                            # Parse list/tuple
-                            import ast
-                            step_data[param] = ast.literal_eval(value)
-                        except:
-                            messagebox.showerror("Error", f"Invalid format for {param}: {value}")
-                            return
-                    elif param == "templates":
-                        # Split comma-separated values
-                        step_data[param] = [t.strip() for t in value.split(",") if t.strip()]
-                    else:
-                        step_data[param] = value
-            
-            # Add global parameters
-            if optional_var.get():
-                step_data["optional"] = True
-            
-            step_delay = step_delay_var.get().strip()
-            if step_delay:
-                try:
-                    step_data["step_delay"] = float(step_delay)
-                except ValueError:
-                    messagebox.showerror("Error", f"Invalid step delay: {step_delay}")
-                    return
-            
-            result[0] = step_data
-            dialog.destroy()
+        d = {
+            'dialog': dialog, 'title': title_label, 'desc': desc_label,
+            'comment_var': comment_var, 'canvas': canvas, 'params_frame': scrollable_frame,
+            'optional_var': optional_var, 'step_delay_var': step_delay_var,
+            'done': tk.BooleanVar(value=False),
+            'action': None, 'param_fields': {}, 'result': None,
+        }
         
-        def on_cancel():
-            dialog.destroy()
+        ttk.Button(button_frame, text="OK", command=self._on_step_dialog_ok).pack(side=tk.RIGHT, padx=(5, 0))
+        ttk.Button(button_frame, text="Cancel",
+                   command=lambda: self._close_step_dialog(None)).pack(side=tk.RIGHT)
+        dialog.protocol("WM_DELETE_WINDOW", lambda: self._close_step_dialog(None))
         
-        ttk.Button(button_frame, text="OK", command=on_ok).pack(side=tk.RIGHT, padx=(5, 0))
-        ttk.Button(button_frame, text="Cancel", command=on_cancel).pack(side=tk.RIGHT)
+        self._step_dialog = d
+        return d
+    
+    def _on_step_dialog_ok(self):
+        """Validate the step dialog's fields and close it with the resulting step"""
+        d = self._step_dialog
+        step_data = {"action": d['action']}
+        
+        # Add comment if provided
+        comment_text = d['comment_var'].get().strip()
+        if comment_text:
+            step_data["comment"] = comment_text
+        
+        # Add parameters
+        for param, field in d['param_fields'].items():
+            value = field.get()
+            if value:  # Only add non-empty values
+                # Convert values to appropriate types
+                if param in _INT_PARAMS:
+                    try:
+                        step_data[param] = int(value)
+                    except ValueError:
+                        messagebox.showerror("Error", f"Invalid number for {param}: {value}")
+                        return
+                elif param in _FLOAT_PARAMS:
+                    try:
+                        step_data[param] = float(value)
+                    except ValueError:
+                        messagebox.showerror("Error", f"Invalid decimal for {param}: {value}")
+                        return
+                elif param in _LIST_PARAMS:
+                    try:
+                        step_data[param] = _parse_list_param(param, value)
+                    except ValueError:
+                        messagebox.showerror("Error", f"Invalid format for {param}: {value}")
+                        return
+                elif param == "templates":
+                    # Split comma-separated values
+                    step_data[param] = [t.strip() for t in value.split(",") if t.strip()]
+                else:
+                    step_data[param] = value
+        
+        # Add global parameters
+        if d['optional_var'].get():
+            step_data["optional"] = True
+        
+        step_delay = d['step_delay_var'].get().strip()
+        if step_delay:
+            try:
+                step_data["step_delay"] = float(step_delay)
+            except ValueError:
+                messagebox.showerror("Error", f"Invalid step delay: {step_delay}")
+                return
         
-        # Wait for dialog to close
-        dialog.wait_window()
-        return result[0]
+        self._close_step_dialog(step_data)
+    
+    def _close_step_dialog(self, result):
+        """Hide the step dialog for reuse and hand result back to create_step_dialog"""
+        d = self._step_dialog
+        d['result'] = result
+        d['dialog'].grab_release()
+        d['dialog'].withdraw()
+        d['done'].set(True)
     
     def refresh_tree(self):
         """Refresh the workflow tree display"""
-        # Clear existing items
-        for item in self.tree.get_children():
-            self.tree.delete(item)
+        # Reuse the existing rows, then add or drop only the difference in count
+        children = self.tree.get_children()
+        steps = self.workflow_steps
+        tree = self.tree
+        for i, step in enumerate(steps):
+            values = self._step_values(i, step)
+            if i < len(children):
+                tree.item(children[i], values=values, tags=_row_tags(step))
+            else:
+                tree.insert("", "end", values=values, tags=_row_tags(step))
+        if len(children) > len(steps):
+            tree.delete(*children[len(steps):])
+        # Forget Parameters text of steps that are no longer in the workflow
+        params_text = self._params_text
+        self._params_text = {id(step): params_text[id(step)] for step in steps
+                             if id(step) in params_text}
+        # Reused rows now hold other steps, so an old selection would be wrong
+        tree.selection_set(())
+    
+    def _step_values(self, index, step):
+        """Build the tree row values for a step"""
+        step_num = step.get('step_number', index + 1)
+        action = step.get('action', '')
+        comment = step.get('comment', '')
         
-        # Add steps
-        for i, step in enumerate(self.workflow_steps):
-            step_num = step.get('step_number', i + 1)
-            action = step.get('action', '')
-            comment = step.get('comment', '')
-            
-            # Build parameters string
-            params = []
-            for key, value in step.items():
-                if key not in ['action', 'comment', 'step_number']:
-                    params.append(f"{key}: {value}")
-            params_str = ", ".join(params)
-            
-            self.tree.insert("", "end", values=(step_num, action, params_str, comment))
+        # Build parameters string once per step dict; edits replace the dict,
+        # so a cached string is never stale. The memo lives beside the steps, not
+        # in them: they may be the caller's live workflow (existing_workflow)
+        entry = self._params_text.get(id(step))
+        if entry is not None and entry[0] is step:
+            params_str = entry[1]
+        else:
+            params_str = ", ".join(f"{key}: {value}" for key, value in step.items()
+                                   if key not in _ROW_SKIP_KEYS)
+            self._params_text[id(step)] = (step, params_str)
+        
+        return (step_num, action, params_str, comment)
+    
+    def _render_step(self, index):
+        """Update the tree row of a single step in place"""
+        item = self.tree.get_children()[index]
+        step = self.workflow_steps[index]
+        self.tree.item(item, values=self._step_values(index, step), tags=_row_tags(step))
     
     def get_selected_step_index(self):
         """Get the index of the currently selected step"""
@@ -533,11 +916,10 @@ class WorkflowBuilder:
         self.workflow_steps[index], self.workflow_steps[index - 1] = \
             self.workflow_steps[index - 1], self.workflow_steps[index]
         
-        self.refresh_tree()
-        # Reselect the moved item
-        children = self.tree.get_children()
-        if index - 1 < len(children):
-            self.tree.selection_set(children[index - 1])
+        # Rows carry their own step number, so moving the one row is enough
+        item = self.tree.get_children()[index]
+        self.tree.move(item, "", index - 1)
+        self.tree.selection_set(item)
     
     def move_step_down(self):
         """Move selected step down"""
@@ -549,11 +931,10 @@ class WorkflowBuilder:
         self.workflow_steps[index], self.workflow_steps[index + 1] = \
             self.workflow_steps[index + 1], self.workflow_steps[index]
         
-        self.refresh_tree()
-        # Reselect the moved item
-        children = self.tree.get_children()
-        if index + 1 < len(children):
-            self.tree.selection_set(children[index + 1])
+        # Rows carry their own step number, so moving the one row is enough
+        item = self.tree.get_children()[index]
+        self.tree.move(item, "", index + 1)
+        self.tree.selection_set(item)
     
     def edit_step(self):
         """Edit the selected step"""
@@ -570,8 +951,105 @@ class WorkflowBuilder:
         if updated_step:
             # Preserve step number
             updated_step['step_number'] = step.get('step_number', index + 1)
+            self._params_text.pop(id(step), None)
             self.workflow_steps[index] = updated_step
-            self.refresh_tree()
+            self._render_step(index)
+    
+    def on_tree_double_click(self, event):
+        """Edit the clicked cell in place, or open the step dialog when that isn't possible"""
+        tree = self.tree
+        item = tree.identify_row(event.y)
+        if not item:
+            return
+        if tree.identify_region(event.x, event.y) != "cell":
+            self.edit_step()
+            return
+        
+        column = tree.identify_column(event.x)
+        index = tree.index(item)
+        step = self.workflow_steps[index]
+        
+        if column == "#4":
+            # Comment column
+            self._open_cell_editor(item, column, index, "comment", step.get('comment', ''))
+            return
+        
+        if column == "#3":
+            # Parameters column: only a step with one plain-text parameter is edited inline
+            params = [key for key in step if key not in _ROW_SKIP_KEYS]
+            if len(params) == 1 and params[0] not in _DIALOG_ONLY_PARAMS:
+                self._open_cell_editor(item, column, index, params[0], step[params[0]])
+                return
+        
+        self.edit_step()
+    
+    def _open_cell_editor(self, item, column, index, key, value):
+        """Place an entry over a tree cell; Return/focus-out writes it back, Escape cancels"""
+        if self._cell_editor is not None:
+            self._cell_editor.destroy()
+        
+        bbox = self.tree.bbox(item, column)
+        if not bbox:
+            self.edit_step()
+            return
+        x, y, width, height = bbox
+        
+        entry = ttk.Entry(self.tree)
+        entry.place(x=x, y=y, width=width, height=height)
+        entry.insert(0, str(value))
+        entry.select_range(0, tk.END)
+        entry.focus_set()
+        self._cell_editor = entry
+        
+        def close(commit):
+            if self._cell_editor is not entry:
+                return
+            self._cell_editor = None
+            text = entry.get().strip()
+            entry.destroy()
+            if commit:
+                self._commit_cell_edit(index, key, text)
+        
+        entry.bind("<Return>", lambda e: close(True))
+        entry.bind("<KP_Enter>", lambda e: close(True))
+        entry.bind("<FocusOut>", lambda e: close(True))
+        entry.bind("<Escape>", lambda e: close(False))
+    
+    def _commit_cell_edit(self, index, key, text):
+        """Store an inline-edited value on the step and redraw its row"""
+        if index >= len(self.workflow_steps):
+            return
+        
+        step = self.workflow_steps[index]
+        if not text:
+            value = None
+        else:
+            try:
+                if key in _INT_PARAMS:
+                    value = int(text)
+                elif key in _FLOAT_PARAMS or key == "step_delay":
+                    value = float(text)
+                elif key in _LIST_PARAMS:
+                    value = _parse_list_param(key, text)
+                else:
+                    value = text
+            except ValueError:
+                messagebox.showerror("Error", f"Invalid value for {key}: {text}")
+                return
+        
+        if step.get(key) == value:
+            return
+        
+        # Replace the step dict rather than mutating it so its cached
+        # Parameters text is rebuilt; an emptied value drops the key
+        updated_step = dict(step)
+        if value is None:
+            del updated_step[key]
+        else:
+            updated_step[key] = value
+        self._params_text.pop(id(step), None)
+        self.workflow_steps[index] = updated_step
+        self._render_step(index)
     
     def delete_step(self):
         """Delete the selected step"""
@@ -580,8 +1058,9 @@ class WorkflowBuilder:
             return
         
         if messagebox.askyesno("Confirm Delete", "Are you sure you want to delete this step?"):
+            self._params_text.pop(id(self.workflow_steps[index]), None)
             del self.workflow_steps[index]
-            self.refresh_tree()
+            self.tree.delete(self.tree.get_children()[index])
     
     def duplicate_step(self):
         """Duplicate the selected step"""
@@ -595,7 +1074,7 @@ class WorkflowBuilder:
         
         # Insert after current step
         self.workflow_steps.insert(index + 1, step)
-        self.refresh_tree()
+        self.tree.insert("", index + 1, values=self._step_values(index + 1, step), tags=_row_tags(step))
     
     def renumber_steps(self):
         """Renumber all steps sequentially"""
@@ -603,7 +1082,9 @@ class WorkflowBuilder:
             step['step_number'] = i + 1
         
         self.step_counter = len(self.workflow_steps)
-        self.refresh_tree()
+        # Only the Step column changes; update the existing rows in place
+        for i, item in enumerate(self.tree.get_children()):
+            self.tree.set(item, "Step", i + 1)
         messagebox.showinfo("Success", "Steps renumbered successfully!")
     
     def new_workflow(self):
@@ -628,15 +1109,22 @@ class WorkflowBuilder:
         file_path = filedialog.askopenfilename(
             title="Load Workflow",
             initialdir="config/games",
-            filetypes=[("YAML files", "*.yaml"), ("All files", "*.*")]
+            filetypes=[("YAML files", "*.yaml"), ("JSON files", "*.json"), ("All files", "*.*")]
         )
         
         if not file_path:
             return
         
+        self._begin_io(f"Loading {file_path}...")
+        future = self._io_pool.submit(_load_yaml_cached, file_path)
+        future.add_done_callback(
+            lambda f: self.root.after(0, self._on_load_done, file_path, f))
+    
+    def _on_load_done(self, file_path, future):
+        """Apply a workflow file parsed by the I/O pool (main thread)"""
+        self._end_io()
         try:
-            with open(file_path, 'r') as f:
-                data = yaml.safe_load(f)
+            data = future.result()
             
             if not isinstance(data, dict):
                 messagebox.showerror("Error", "Invalid YAML format - expected dictionary")
@@ -660,7 +1148,9 @@ class WorkflowBuilder:
             for i, step in enumerate(workflow_data):
                 # Skip non-dictionary entries (comments, etc.)
                 if isinstance(step, dict) and 'action' in step:
-                    # Ensure step has required fields
+                    # Ensure step has required fields. A shallow copy is enough:
+                    # the builder replaces step values rather than mutating them,
+                    # so nested lists can stay shared with the parse cache
                     clean_step = step.copy()
                     if 'step_number' not in clean_step:
                         clean_step['step_number'] = i + 1
@@ -677,44 +1167,101 @@ class WorkflowBuilder:
             messagebox.showerror("Error", f"Failed to load workflow: {e}")
     
     def save_workflow(self):
-        """Save workflow to YAML file"""
-        # Update game config from UI
-        for key, var in self.config_vars.items():
-            self.game_config[key] = var.get()
-        
-        # Generate YAML
-        yaml_content = self.generate_yaml()
+        """Save workflow to YAML file (or JSON when a .json name is chosen)"""
+        self._read_game_config()
         
         # Get save path
-        game_name = self.config_vars['name'].get() or "new_game"
+        game_name = self.game_config['name'] or "new_game"
         filename = f"{game_name.lower().replace(' ', '_')}.yaml"
         
         file_path = filedialog.asksaveasfilename(
             title="Save Workflow",
             initialdir="config/games",
             initialfile=filename,
-            filetypes=[("YAML files", "*.yaml"), ("All files", "*.*")]
+            filetypes=[("YAML files", "*.yaml"), ("JSON files", "*.json"), ("All files", "*.*")]
         )
         
         if not file_path:
             return
         
+        # JSON is valid YAML, so either file loads back through load_workflow
+        if file_path.lower().endswith(".json"):
+            content = self.generate_json()
+        else:
+            content = self.generate_yaml()
+        
+        data = content.encode('utf-8')
+        
+        # Saving identical content over the file we last wrote is a no-op, as long
+        # as nothing else has touched the file since
+        unchanged_mtime = None
+        last = self._last_saved
+        abs_path = os.path.abspath(file_path)
+        if last is not None and last[0] == abs_path and last[1] == data:
+            unchanged_mtime = last[2]
+        
+        self._begin_io(f"Saving {file_path}...")
+        future = self._io_pool.submit(_write_bytes, file_path, data, unchanged_mtime)
+        future.add_done_callback(
+            lambda f: self.root.after(0, self._on_save_done, file_path, data, f))
+    
+    def _on_save_done(self, file_path, data, future):
+        """Report the result of a workflow write (main thread)"""
+        self._end_io()
         try:
-            with open(file_path, 'w') as f:
-                f.write(yaml_content)
-            
-            messagebox.showinfo("Success", f"Workflow saved to {file_path}")
+            mtime = future.result()
+            self._last_saved = (os.path.abspath(file_path), data, mtime)
+            self.set_status(f"Workflow saved to {file_path}")
             
         except Exception as e:
             messagebox.showerror("Error", f"Failed to save workflow: {e}")
     
+    def set_status(self, text, clear_ms=3000):
+        """Show a notice in the status bar and clear it after clear_ms"""
+        self.status_var.set(text)
+        if self._status_clear_id is not None:
+            self.root.after_cancel(self._status_clear_id)
+        self._status_clear_id = self.root.after(clear_ms, self._clear_status)
+    
+    def _clear_status(self):
+        self._status_clear_id = None
+        self.status_var.set("")
+    
+    def _begin_io(self, text):
+        """Show text and a running progress bar while a file job is pending"""
+        if self._status_clear_id is not None:
+            self.root.after_cancel(self._status_clear_id)
+            self._status_clear_id = None
+        self.status_var.set(text)
+        self._io_pending += 1
+        if self._io_pending == 1:
+            self._io_progress.pack(side=tk.RIGHT)
+            self._io_progress.start(15)
+    
+    def _end_io(self):
+        """Hide the progress bar once the last pending file job has finished"""
+        self._io_pending -= 1
+        if self._io_pending == 0:
+            self._io_progress.stop()
+            self._io_progress.pack_forget()
+            if self._status_clear_id is None:
+                self.status_var.set("")
+    
+    def _read_game_config(self):
+        """Copy the game config fields into self.game_config, one widget read per field"""
+        for key, entry in self.config_entries.items():
+            self.game_config[key] = entry.get().strip() if key == "startup_time" else entry.get()
+        return self.game_config
+    
     def preview_yaml(self):
-        """Preview the generated YAML"""
-        # Update game config from UI
-        for key, var in self.config_vars.items():
-            self.game_config[key] = var.get()
+        """Preview the generated YAML
         
-        yaml_content = self.generate_yaml()
+        The window opens at once; unless the text is already cached it is
+        generated on the I/O pool and filled in when ready.
+        """
+        self._read_game_config()
+        key = self._yaml_key()
+        cached = self._yaml_render
         
         # Create preview window
         preview_window = tk.Toplevel(self.root)
@@ -725,86 +1272,130 @@ class WorkflowBuilder:
         text_frame = ttk.Frame(preview_window)
         text_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
         
-        text_widget = tk.Text(text_frame, font=("Consolas", 10))
+        # Read-only view, so no undo stack
+        text_widget = tk.Text(text_frame, font=("Consolas", 10), undo=False, autoseparators=False)
         scrollbar = ttk.Scrollbar(text_frame, orient="vertical", command=text_widget.yview)
         text_widget.configure(yscrollcommand=scrollbar.set)
         
         text_widget.pack(side="left", fill="both", expand=True)
         scrollbar.pack(side="right", fill="y")
         
-        text_widget.insert("1.0", yaml_content)
-        text_widget.config(state="disabled")
+        yaml_content = [None]
         
-        # Copy button
+        # Copy button, enabled once the text is there
         def copy_to_clipboard():
             self.root.clipboard_clear()
-            self.root.clipboard_append(yaml_content)
+            self.root.clipboard_append(yaml_content[0])
             messagebox.showinfo("Copied", "YAML content copied to clipboard!")
         
-        ttk.Button(preview_window, text="📋 Copy to Clipboard", 
-                  command=copy_to_clipboard).pack(pady=5)
+        copy_button = ttk.Button(preview_window, text="📋 Copy to Clipboard", 
+                                 command=copy_to_clipboard, state="disabled")
+        copy_button.pack(pady=5)
+        
+        def show(text):
+            yaml_content[0] = text
+            # The first chunk goes in now; the rest follow one per idle callback so
+            # a large workflow doesn't hold up the window
+            chunks = [text[i:i + _PREVIEW_TEXT_CHUNK]
+                      for i in range(0, len(text), _PREVIEW_TEXT_CHUNK)]
+            chunks.reverse()
+            
+            def insert_next():
+                try:
+                    if chunks:
+                        text_widget.insert(tk.END, chunks.pop())
+                    if chunks:
+                        text_widget.after_idle(insert_next)
+                    else:
+                        text_widget.config(state="disabled")
+                except tk.TclError:
+                    # Preview closed while text was still going in
+                    pass
+            
+            try:
+                text_widget.delete("1.0", tk.END)
+                copy_button.config(state="normal")
+            except tk.TclError:
+                return
+            insert_next()
+        
+        if cached is not None and cached[0] == key:
+            show(cached[1])
+            return
+        
+        text_widget.insert("1.0", "Generating YAML...")
+        # Shallow step copies, so in-place changes such as renumbering can't
+        # race the worker iterating them
+        config = self._yaml_config()
+        steps = [dict(step) for step in self.workflow_steps]
+        self._begin_io("Generating YAML...")
+        future = self._io_pool.submit(_render_workflow_yaml, config, steps)
+        future.add_done_callback(
+            lambda f: self.root.after(0, self._on_preview_done, key, show, f))
+    
+    def _on_preview_done(self, key, show, future):
+        """Cache the YAML generated for a preview and display it (main thread)"""
+        self._end_io()
+        try:
+            text = future.result()
+        except Exception as e:
+            messagebox.showerror("Error", f"Failed to generate YAML: {e}")
+            return
+        self._yaml_render = (key, text)
+        show(text)
     
     def generate_yaml(self):
-        """Generate YAML content from current configuration"""
-        lines = []
-        
-        # Add game configuration
-        for key, var in self.config_vars.items():
-            value = var.get()
+        """Generate YAML content from current configuration (call _read_game_config first)
+        
+        The text is reused while the config values, the step dicts and their
+        step numbers are unchanged. Edits replace a step's dict, so holding the
+        dicts themselves in the key makes the common check an identity check.
+        """
+        key = self._yaml_key()
+        cached = self._yaml_render
+        if cached is not None and cached[0] == key:
+            return cached[1]
+        
+        text = _render_workflow_yaml(self._yaml_config(), self.workflow_steps)
+        self._yaml_render = (key, text)
+        return text
+    
+    def _yaml_key(self):
+        """Cache key for generate_yaml: config values, step dicts and step numbers"""
+        steps = self.workflow_steps
+        return (tuple(self.game_config.get(k, "") for k in self.config_entries),
+                tuple(steps), tuple(step.get('step_number') for step in steps))
+    
+    def _yaml_config(self):
+        """Game config as written to the top of the YAML file"""
+        config = {}
+        for key in self.config_entries:
+            value = self.game_config.get(key, "")
             if key == "startup_time":
-                lines.append(f"{key}: {int(value) if value else 60}")
-            elif key in ["app_id"]:
-                lines.append(f'{key}: "{value}"')
+                config[key] = int(value) if value else 60
             else:
-                lines.append(f'{key}: "{value}"')
-        
-        lines.append("\nworkflow:")
-        
-        # Add workflow steps with proper comment formatting
-        for i, step in enumerate(self.workflow_steps):
-            # Add comment if exists - preserve exact spacing
-            comment = step.get('comment', '').strip()
-            if comment:
-                lines.append(f"  # {comment}")
-            
-            # Add step number comment
-            step_num = step.get('step_number', i + 1)
-            lines.append(f"  #{step_num}")
-            
-            # Build step
-            lines.append(f"  - action: \"{step['action']}\"")
-            
-            # Add parameters in logical order
-            param_order = ["template", "templates", "timeout", "threshold", "region", "button", "offset",
-                          "move_duration", "pre_click_delay", "post_click_delay", "key", "duration", 
-                          "text", "x", "y", "seconds", "name", "message", "force", "process_name",
-                          "action_to_retry", "max_retries", "retry_delay", "optional", "step_delay"]
-            
-            # Add parameters
-            for param in param_order:
-                if param in step and param not in ['action', 'comment', 'step_number']:
-                    value = step[param]
-                    if isinstance(value, str):
-                        lines.append(f'    {param}: "{value}"')
-                    elif isinstance(value, list):
-                        if param == "templates":
-                            lines.append(f'    {param}: {value}')
-                        else:
-                            lines.append(f'    {param}: {value}')
-                    else:
-                        lines.append(f'    {param}: {value}')
-            
-            # Add any remaining parameters
-            for key, value in step.items():
-                if key not in param_order and key not in ['action', 'comment', 'step_number']:
-                    if isinstance(value, str):
-                        lines.append(f'    {key}: "{value}"')
-                    else:
-                        lines.append(f'    {key}: {value}')
-            
-            lines.append("")  # Empty line between steps
+                config[key] = str(value)
+        return config
+    
+    def generate_json(self):
+        """Generate JSON content from current configuration
+        
+        Same data as generate_yaml; step comments are kept as a "comment" key
+        since JSON has no comments, and step numbers are implied by position.
+        """
+        data = {}
+        for key in self.config_entries:
+            value = self.game_config.get(key, "")
+            if key == "startup_time":
+                data[key] = int(value) if value else 60
+            else:
+                data[key] = str(value)
         
-        return '\n'.join(lines)
+        data["workflow"] = [
+            {key: value for key, value in step.items() if key != "step_number"}
+            for step in self.workflow_steps
+        ]
+        return json.dumps(data, indent=2, ensure_ascii=False) + "\n"
     
     def load_existing_workflow(self):
         """Load existing workflow into the builder"""
@@ -812,26 +1403,80 @@ class WorkflowBuilder:
     
     def refresh_templates(self):
         """Refresh the template list from the templates directory"""
+        templates = self._load_templates()
+        if templates is not None and templates is self._listed_templates:
+            # Directory unchanged since the listbox was last filled
+            return
+        self._listed_templates = templates
+        
         self.template_listbox.delete(0, tk.END)
+        self._preview_cache.clear()
         
-        templates_dir = Path("templates/screens")
-        if not templates_dir.exists():
+        if templates is None:
             self.template_listbox.insert(tk.END, "No templates directory found")
             return
         
-        template_files = []
-        for game_dir in templates_dir.iterdir():
-            if game_dir.is_dir():
-                for template_file in game_dir.glob("*.png"):
-                    relative_path = template_file.relative_to(templates_dir)
-                    template_files.append(str(relative_path))
-        
-        if not template_files:
+        if not self._template_index:
             self.template_listbox.insert(tk.END, "No template files found")
             return
         
-        for template in sorted(template_files):
-            self.template_listbox.insert(tk.END, template)
+        # One variadic insert instead of a Tcl call per template
+        self.template_listbox.insert(tk.END, *sorted(self._template_index))
+    
+    def _load_templates(self):
+        """Scan templates/screens and return {game: sorted png names}, or None if it is missing
+        
+        The listing is cached; it is reused as long as templates/screens and every
+        game folder keep the mtimes they had at the last scan.
+        """
+        root = _TEMPLATES_ROOT
+        try:
+            root_mtime = os.stat(root).st_mtime_ns
+        except FileNotFoundError:
+            self._templates_cache = None
+            self._templates_cache_mtimes = {}
+            self._template_index = {}
+            self._flat_templates = ()
+            return None
+        
+        mtimes = self._templates_cache_mtimes
+        if self._templates_cache is not None and mtimes.get(root) == root_mtime:
+            try:
+                if all(os.stat(path).st_mtime_ns == mtime
+                       for path, mtime in mtimes.items() if path != root):
+                    return self._templates_cache
+            except OSError:
+                pass
+        
+        # os.scandir reuses the directory entry's type info, so no extra stat
+        # calls or Path objects per file
+        templates = {}
+        mtimes = {root: root_mtime}
+        try:
+            with os.scandir(root) as games:
+                for game in games:
+                    if not game.is_dir():
+                        continue
+                    mtimes[game.path] = game.stat().st_mtime_ns
+                    files = []
+                    with os.scandir(game.path) as entries:
+                        for entry in entries:
+                            name = entry.name
+                            if name.endswith(".png") and entry.is_file(follow_symlinks=False):
+                                files.append(name)
+                    if files:
+                        templates[game.name] = sorted(files)
+        except FileNotFoundError:
+            return None
+        
+        self._templates_cache = templates
+        self._templates_cache_mtimes = mtimes
+        self._template_index = {
+            os.path.join(game, name): os.path.join(root, game, name)
+            for game, names in templates.items() for name in names
+        }
+        self._flat_templates = tuple(sorted({name for names in templates.values() for name in names}))
+        return templates
     
     def on_template_double_click(self, event):
         """Handle double-click on template to preview it"""
@@ -847,76 +1492,106 @@ class WorkflowBuilder:
     
     def browse_templates(self):
         """Open templates folder in file explorer"""
-        templates_dir = Path("templates/screens")
-        templates_dir.mkdir(parents=True, exist_ok=True)
+        os.makedirs(_TEMPLATES_ROOT, exist_ok=True)
         
         try:
-            import subprocess
-            import platform
-            
-            if platform.system() == "Windows":
-                subprocess.run(['explorer', str(templates_dir.resolve())])
-            elif platform.system() == "Darwin":  # macOS
-                subprocess.run(['open', str(templates_dir.resolve())])
-            else:  # Linux
-                subprocess.run(['xdg-open', str(templates_dir.resolve())])
-                
+            _open_folder(os.path.abspath(_TEMPLATES_ROOT))
         except Exception as e:
             messagebox.showerror("Error", f"Failed to open templates folder: {e}")
     
-    def preview_template(self, template_name):
-        """Preview a template image"""
+    def preview_template(self, template_name, max_entries=32):
+        """Preview a template image
+        
+        Resized previews are kept in a small LRU cache, so reopening the same
+        template skips the decode and resize.
+        """
+        if Image is None:
+            messagebox.showerror("Error", "PIL/Pillow is required for template preview. Install with: pip install Pillow")
+            return
+        
         try:
-            import PIL.Image
-            import PIL.ImageTk
-            
-            template_path = Path("templates/screens") / template_name
-            if not template_path.exists():
-                messagebox.showerror("Error", f"Template not found: {template_path}")
+            template_path = self._template_index.get(template_name)
+            if template_path is None:
+                messagebox.showerror("Error", f"Template not found: {template_name}")
                 return
             
-            # Create preview window
-            preview_window = tk.Toplevel(self.root)
-            preview_window.title(f"Template Preview: {template_name}")
-            preview_window.geometry("600x500")
-            
-            # Load and display image
-            image = PIL.Image.open(template_path)
-            
             # Resize if too large
-            max_size = (550, 400)
-            image.thumbnail(max_size, PIL.Image.Resampling.LANCZOS)
-            
-            photo = PIL.ImageTk.PhotoImage(image)
-            
-            # Create image label
-            image_label = tk.Label(preview_window, image=photo)
-            image_label.image = photo  # Keep a reference
-            image_label.pack(padx=10, pady=10)
-            
-            # Info frame
-            info_frame = ttk.Frame(preview_window)
-            info_frame.pack(fill=tk.X, padx=10, pady=5)
+            max_size = _PREVIEW_MAX_SIZE
             
-            ttk.Label(info_frame, text=f"File: {template_name}").pack(anchor="w")
-            ttk.Label(info_frame, text=f"Size: {image.size[0]}x{image.size[1]} pixels").pack(anchor="w")
-            ttk.Label(info_frame, text=f"Path: {template_path}").pack(anchor="w")
-            
-            # Copy filename button
-            def copy_filename():
-                filename = Path(template_name).name
-                self.root.clipboard_clear()
-                self.root.clipboard_append(filename)
-                messagebox.showinfo("Copied", f"Filename '{filename}' copied to clipboard!")
+            # The file mtime in the key drops stale previews of edited templates
+            key = (template_name, max_size, os.stat(template_path).st_mtime_ns)
+            cached = self._preview_cache.get(key)
+            if cached is None:
+                # Load and shrink in place; draft lets decoders that support it
+                # (JPEG) skip pixels, and BILINEAR is plenty at this downscale.
+                # The with block closes the file once the PhotoImage holds the pixels
+                with Image.open(template_path) as image:
+                    original_size = image.size
+                    image.draft("RGB", max_size)
+                    image.thumbnail(max_size, Image.Resampling.BILINEAR)
+                    cached = (ImageTk.PhotoImage(image), original_size)
+                self._preview_cache[key] = cached
+                if len(self._preview_cache) > max_entries:
+                    self._preview_cache.popitem(last=False)
+            else:
+                self._preview_cache.move_to_end(key)
+            photo, image_size = cached
             
-            ttk.Button(info_frame, text="📋 Copy Filename", 
-                      command=copy_filename).pack(pady=5)
-                      
-        except ImportError:
-            messagebox.showerror("Error", "PIL/Pillow is required for template preview. Install with: pip install Pillow")
+            # One preview window is reused; only its image and labels change
+            p = self._preview_window or self._build_preview_window()
+            preview_window = p['window']
+            preview_window.title(f"Template Preview: {template_name}")
+            p['image'].configure(image=photo)
+            p['image'].image = photo  # Keep a reference
+            p['file'].configure(text=f"File: {template_name}")
+            p['size'].configure(text=f"Size: {image_size[0]}x{image_size[1]} pixels")
+            p['path'].configure(text=f"Path: {template_path}")
+            p['template'] = template_name
+            preview_window.deiconify()
+            preview_window.lift()
+        
         except Exception as e:
             messagebox.showerror("Error", f"Failed to preview template: {e}")
 
+    def _build_preview_window(self):
+        """Create the template preview window; closing it only hides it for reuse"""
+        preview_window = tk.Toplevel(self.root)
+        preview_window.geometry("600x500")
+        
+        # Create image label
+        image_label = tk.Label(preview_window)
+        image_label.pack(padx=10, pady=10)
+        
+        def on_close():
+            # Drop the label's hold on the image; only _preview_cache keeps it now
+            image_label.configure(image="")
+            image_label.image = None
+            preview_window.withdraw()
+        
+        preview_window.protocol("WM_DELETE_WINDOW", on_close)
+        
+        # Info frame
+        info_frame = ttk.Frame(preview_window)
+        info_frame.pack(fill=tk.X, padx=10, pady=5)
+        
+        p = {'window': preview_window, 'image': image_label, 'template': None}
+        for name in ('file', 'size', 'path'):
+            p[name] = ttk.Label(info_frame)
+            p[name].pack(anchor="w")
+        
+        # Copy filename button
+        def copy_filename():
+            filename = os.path.basename(p['template'])
+            self.root.clipboard_clear()
+            self.root.clipboard_append(filename)
+            messagebox.showinfo("Copied", f"Filename '{filename}' copied to clipboard!")
+        
+        ttk.Button(info_frame, text="📋 Copy Filename", 
+                  command=copy_filename).pack(pady=5)
+        
+        self._preview_window = p
+        return p
+
 # Main function to run the workflow builder
 def main():
     app = WorkflowBuilder()